@@ -2,56 +2,860 @@ import os
 from dotenv import load_dotenv
 import requests
 import json
+import hashlib
+import sqlite3
+import zlib
 import time
-from typing import Dict, List, Optional, Set, Tuple
-from grafo import Grafo
+import heapq
+import multiprocessing
+import random
+import threading
+import queue
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+from grafo import Grafo, GrafoCSR
 import matplotlib.pyplot as plt
 import math
-from collections import defaultdict, deque
+import numpy as np
+from collections import OrderedDict, defaultdict, deque
 
 load_dotenv()
 
+
+def _brandes(offsets: Sequence[int], destinos: Sequence[int], fontes: Iterable[int],
+             betweenness: List[float], quadrados: Optional[List[float]] = None):
+    """
+    Acumula em betweenness as dependências do algoritmo de Brandes para as fontes
+    informadas, percorrendo o grafo CSR (offsets/destinos) por busca em largura
+    
+    offsets e destinos podem ser memoryviews dos arrays do snapshot: o acesso por
+    índice custa o mesmo que em listas, sem copiar os dados.
+    
+    Se quadrados for informado, acumula também o quadrado de cada dependência
+    (usado para estimar a variância na amostragem de fontes).
+    """
+    n = len(offsets) - 1
+    
+    # Estruturas reaproveitadas entre as fontes
+    P = [[] for _ in range(n)]
+    sigma = [0] * n
+    d = [-1] * n
+    delta = [0.0] * n
+    
+    for s in fontes:
+        S = []
+        sigma[s] = 1
+        d[s] = 0
+        Q = deque()
+        Q.append(s)
+        
+        while Q:
+            v = Q.popleft()
+            S.append(v)
+            for w in destinos[offsets[v]:offsets[v + 1]]:
+                if d[w] < 0:
+                    Q.append(w)
+                    d[w] = d[v] + 1
+                if d[w] == d[v] + 1:
+                    sigma[w] += sigma[v]
+                    P[w].append(v)
+        
+        while S:
+            w = S.pop()
+            for v in P[w]:
+                delta[v] += (sigma[v] / sigma[w]) * (1 + delta[w])
+            if w != s:
+                betweenness[w] += delta[w]
+                if quadrados is not None:
+                    quadrados[w] += delta[w] * delta[w]
+            # Limpa apenas os vértices alcançados nesta fonte
+            P[w].clear()
+            sigma[w] = 0
+            d[w] = -1
+            delta[w] = 0.0
+
+
+# Snapshot CSR compartilhado pelos processos do pool de betweenness
+_CSR_WORKER = None
+
+
+def _visoes_csr(csr: GrafoCSR) -> Tuple[memoryview, memoryview]:
+    """Memoryviews (sem cópia) dos arrays de offsets e destinos do snapshot"""
+    return (memoryview(np.ascontiguousarray(csr.offsets)),
+            memoryview(np.ascontiguousarray(csr.destinos)))
+
+
+def _inicializar_worker_brandes(csr: GrafoCSR):
+    """
+    Inicializa um processo do pool com o snapshot, sem copiar os arrays: com fork eles
+    são herdados do processo pai e snapshots mapeados de arquivo são reabertos pelo caminho
+    """
+    global _CSR_WORKER
+    _CSR_WORKER = (csr, *_visoes_csr(csr))
+
+
+def _brandes_lote(fontes: Sequence[int]) -> Tuple[List[float], List[float]]:
+    """Calcula os vetores parciais (soma e soma dos quadrados) de um lote de fontes no pool"""
+    _, offsets, destinos = _CSR_WORKER
+    parcial = [0.0] * (len(offsets) - 1)
+    quadrados = [0.0] * (len(offsets) - 1)
+    _brandes(offsets, destinos, fontes, parcial, quadrados)
+    return parcial, quadrados
+
+
+class _AcumuladorBrandes:
+    """
+    Executa o algoritmo de Brandes para conjuntos de fontes, em série ou distribuindo
+    lotes de fontes entre um pool de processos que compartilha o snapshot CSR
+    """
+    
+    def __init__(self, csr: GrafoCSR, processos: int = 1, tamanho_lote: Optional[int] = None):
+        self.csr = csr
+        self.n = csr.quantidade_vertices()
+        self.processos = processos
+        self.tamanho_lote = tamanho_lote
+        self._pool = None
+        self._visoes = None
+    
+    def __enter__(self) -> '_AcumuladorBrandes':
+        if self.processos > 1:
+            self._pool = multiprocessing.Pool(self.processos, initializer=_inicializar_worker_brandes,
+                                              initargs=(self.csr,))
+        else:
+            self._visoes = _visoes_csr(self.csr)
+        return self
+    
+    def __exit__(self, *exc):
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool = None
+    
+    def acumular(self, fontes: Sequence[int]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Retorna a soma das dependências de cada vértice sobre as fontes e a soma dos quadrados
+        """
+        if self._pool is None:
+            soma = [0.0] * self.n
+            quadrados = [0.0] * self.n
+            _brandes(*self._visoes, fontes, soma, quadrados)
+            return np.array(soma), np.array(quadrados)
+        
+        tamanho = self.tamanho_lote or max(1, math.ceil(len(fontes) / (4 * self.processos)))
+        lotes = [fontes[i:i + tamanho] for i in range(0, len(fontes), tamanho)]
+        soma = np.zeros(self.n)
+        quadrados = np.zeros(self.n)
+        for parcial, parcial_quadrados in self._pool.imap_unordered(_brandes_lote, lotes):
+            soma += parcial
+            quadrados += parcial_quadrados
+        return soma, quadrados
+
+
+class _ErroTransitorio(Exception):
+    """Falha temporária da API (5xx, limite secundário, rede) que vale a pena repetir"""
+    
+    def __init__(self, mensagem: str, espera: Optional[float] = None):
+        super().__init__(mensagem)
+        self.espera = espera
+
+
+def _instante_utc(data_hora: str) -> float:
+    """Converte um horário ISO 8601 da API (ex.: 2024-01-01T00:00:00Z) em timestamp"""
+    return datetime.fromisoformat(data_hora.replace('Z', '+00:00')).timestamp()
+
+
+class _CachePaginas:
+    """
+    Cache em disco (SQLite) das respostas GraphQL, chaveado por endpoint, consulta e
+    variáveis (incluindo o cursor)
+    
+    Entradas mais antigas que ttl segundos são ignoradas e apagadas (exceto quando a
+    leitura pede para ignorar o ttl); quando o total armazenado passa de max_bytes, as
+    entradas menos usadas recentemente são removidas.
+    """
+    LOTE_REMOCAO = 64  # Entradas lidas por vez ao liberar espaço
+    
+    def __init__(self, caminho: str, ttl: Optional[float] = None, max_bytes: Optional[int] = None):
+        self.caminho = caminho
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._trava = threading.Lock()
+        self._conexao = sqlite3.connect(caminho, check_same_thread=False)
+        self._conexao.execute(
+            "CREATE TABLE IF NOT EXISTS paginas ("
+            "chave TEXT PRIMARY KEY, resposta BLOB NOT NULL, "
+            "criada REAL NOT NULL, acessada REAL NOT NULL, tamanho INTEGER NOT NULL)")
+        self._conexao.execute("CREATE INDEX IF NOT EXISTS paginas_acessada ON paginas (acessada)")
+        self._conexao.commit()
+        # Total armazenado, mantido em memória para não somar a tabela a cada gravação
+        self._total, = self._conexao.execute("SELECT COALESCE(SUM(tamanho), 0) FROM paginas").fetchone()
+    
+    @staticmethod
+    def chave(url: str, query: str, variables: Optional[Dict]) -> str:
+        """Gera a chave de uma consulta (hash do endpoint, texto e variáveis)"""
+        conteudo = json.dumps([url, query, variables or {}], sort_keys=True)
+        return hashlib.sha256(conteudo.encode('utf-8')).hexdigest()
+    
+    def obter(self, chave: str, ignorar_ttl: bool = False) -> Optional[Tuple[Dict, float]]:
+        """
+        Retorna a resposta armazenada e o horário (epoch) em que foi guardada, ou None
+        se ausente ou expirada
+        
+        Args:
+            ignorar_ttl: Retorna a resposta mesmo expirada, sem apagá-la (modo offline)
+        """
+        agora = time.time()
+        with self._trava:
+            linha = self._conexao.execute(
+                "SELECT resposta, criada FROM paginas WHERE chave = ?", (chave,)).fetchone()
+            if linha is None:
+                return None
+            resposta, criada = linha
+            if not ignorar_ttl and self.ttl is not None and agora - criada > self.ttl:
+                self._conexao.execute("DELETE FROM paginas WHERE chave = ?", (chave,))
+                self._total -= len(resposta)
+                self._conexao.commit()
+                return None
+            self._conexao.execute("UPDATE paginas SET acessada = ? WHERE chave = ?", (agora, chave))
+            self._conexao.commit()
+        return json.loads(zlib.decompress(resposta)), criada
+    
+    def guardar(self, chave: str, resposta: Dict):
+        """Armazena uma resposta e aplica o limite de tamanho"""
+        dados = zlib.compress(json.dumps(resposta).encode('utf-8'))
+        agora = time.time()
+        with self._trava:
+            anterior = self._conexao.execute("SELECT tamanho FROM paginas WHERE chave = ?", (chave,)).fetchone()
+            self._conexao.execute(
+                "INSERT OR REPLACE INTO paginas VALUES (?, ?, ?, ?, ?)",
+                (chave, dados, agora, agora, len(dados)))
+            self._total += len(dados) - (anterior[0] if anterior else 0)
+            if self.max_bytes is not None and self._total > self.max_bytes:
+                # Remove as menos usadas recentemente até caber no limite (em lotes pelo índice)
+                while self._total > self.max_bytes:
+                    antigas = self._conexao.execute(
+                        "SELECT chave, tamanho FROM paginas ORDER BY acessada LIMIT ?",
+                        (self.LOTE_REMOCAO,)).fetchall()
+                    if not antigas:
+                        break
+                    for chave_antiga, tamanho in antigas:
+                        if self._total <= self.max_bytes:
+                            break
+                        self._conexao.execute("DELETE FROM paginas WHERE chave = ?", (chave_antiga,))
+                        self._total -= tamanho
+            self._conexao.commit()
+    
+    def fechar(self):
+        """Fecha a conexão com o banco do cache"""
+        with self._trava:
+            self._conexao.close()
+
+
+class _RegistroInteracoes:
+    """
+    Interações de cada issue/PR guardadas fora da memória, num banco SQLite temporário
+    (privado e apagado ao fechar)
+    
+    É o registro bruto de todas as interações coletadas, sem o filtro de
+    min_interactions e sem as remoções feitas pelas análises no grafo. Permite
+    substituir as interações de uma conversa atualizada calculando apenas a
+    diferença em relação às registradas antes.
+    """
+    
+    def __init__(self):
+        # Nome vazio: arquivo temporário do próprio SQLite; só o cache de páginas fica em memória
+        self._conexao = sqlite3.connect('', check_same_thread=False)
+        self._conexao.execute("PRAGMA synchronous = OFF")
+        self._conexao.execute(
+            "CREATE TABLE interacoes ("
+            "conversa TEXT NOT NULL, origem TEXT NOT NULL, destino TEXT NOT NULL, peso INTEGER NOT NULL)")
+        self._conexao.execute("CREATE INDEX interacoes_conversa ON interacoes (conversa)")
+        self._conexao.execute("CREATE INDEX interacoes_origem ON interacoes (origem)")
+        self._conexao.execute("CREATE INDEX interacoes_destino ON interacoes (destino)")
+        self._conexao.commit()
+    
+    def substituir(self, conversa: str, interacoes: Dict[str, Dict[str, int]]) -> Dict[str, Dict[str, int]]:
+        """
+        Troca as interações registradas de uma conversa pelas informadas
+        
+        Returns:
+            Variação do peso de cada interação (origem -> destino -> variação)
+        """
+        delta = defaultdict(lambda: defaultdict(int))
+        for origem, destino, peso in self._conexao.execute(
+                "SELECT origem, destino, peso FROM interacoes WHERE conversa = ?", (conversa,)):
+            delta[origem][destino] -= peso
+        linhas = []
+        for origem, destinos in interacoes.items():
+            for destino, peso in destinos.items():
+                delta[origem][destino] += peso
+                linhas.append((conversa, origem, destino, peso))
+        
+        self._conexao.execute("DELETE FROM interacoes WHERE conversa = ?", (conversa,))
+        self._conexao.executemany("INSERT INTO interacoes VALUES (?, ?, ?, ?)", linhas)
+        self._conexao.commit()
+        return delta
+    
+    def interacoes_usuario(self, usuario: str) -> Tuple[Dict[str, int], Dict[str, int]]:
+        """
+        Retorna o peso total das interações feitas e recebidas pelo usuário em todas as
+        conversas, por usuário do outro lado
+        """
+        feitas = dict(self._conexao.execute(
+            "SELECT destino, SUM(peso) FROM interacoes WHERE origem = ? GROUP BY destino", (usuario,)))
+        recebidas = dict(self._conexao.execute(
+            "SELECT origem, SUM(peso) FROM interacoes WHERE destino = ? GROUP BY origem", (usuario,)))
+        return feitas, recebidas
+    
+    def agregadas(self) -> Iterator[Tuple[str, str, int]]:
+        """Gera (origem, destino, peso total) de cada interação somada em todas as conversas"""
+        return self._conexao.execute(
+            "SELECT origem, destino, SUM(peso) FROM interacoes GROUP BY origem, destino")
+    
+    def fechar(self):
+        """Fecha a conexão, apagando o arquivo temporário"""
+        self._conexao.close()
+
+
+class _AgendadorRequisicoes:
+    """
+    Distribui as requisições das threads de coleta dentro da janela do rate limit,
+    usando o custo e o saldo (rateLimit) devolvidos em cada resposta da API
+    
+    Enquanto o saldo estiver acima de FRACAO_LIVRE do limite, as requisições saem
+    sem espera (só a concorrência limita); abaixo disso, o saldo restante é espalhado
+    uniformemente até o reinício da janela, e com o saldo esgotado as threads
+    aguardam o reinício.
+    """
+    FRACAO_LIVRE = 0.5  # Parte do limite que pode ser consumida sem espaçamento
+    RESERVA = 10  # Pontos que nunca são gastos (margem para requisições em andamento)
+    
+    def __init__(self, maximo: Optional[int] = None):
+        self.maximo = maximo
+        self.realizadas = 0
+        self.limite = None
+        self.restante = None
+        self.reinicio = None
+        self.custo = 1.0
+        self.cache_mais_antigo = None  # Horário da página mais antiga servida pelo cache
+        self._proxima = 0.0
+        self._trava = threading.Lock()
+    
+    def reservar(self, nova_pagina: bool = True) -> Optional[int]:
+        """
+        Reserva a próxima requisição, aguardando a vez dela se necessário
+        
+        Args:
+            nova_pagina: Se False, a requisição repete uma página já reservada (nova
+                tentativa): respeita o ritmo, mas não conta para o máximo de páginas
+        
+        Returns:
+            Número da requisição, ou None se o máximo de páginas já foi atingido
+        """
+        with self._trava:
+            if nova_pagina:
+                if self.maximo is not None and self.realizadas >= self.maximo:
+                    return None
+                self.realizadas += 1
+            numero = self.realizadas
+            inicio = max(time.time(), self._proxima)
+            intervalo = 0.0
+            
+            if self.restante is not None:
+                disponiveis = (self.restante - self.RESERVA) / self.custo
+                if disponiveis < 1:
+                    # Saldo esgotado: espera a janela reiniciar (o novo saldo vem na resposta)
+                    inicio = max(inicio, self.reinicio)
+                    self.restante = None
+                elif self.restante < self.limite * self.FRACAO_LIVRE:
+                    intervalo = max(self.reinicio - inicio, 0.0) / disponiveis
+                    self.restante -= self.custo
+                else:
+                    self.restante -= self.custo
+            
+            self._proxima = inicio + intervalo
+        
+        espera = inicio - time.time()
+        if espera > 0:
+            time.sleep(espera)
+        return numero
+    
+    def registrar(self, rate_limit: Optional[Dict]):
+        """Atualiza custo, saldo e reinício da janela a partir do campo rateLimit da resposta"""
+        if not rate_limit:
+            return
+        reinicio = _instante_utc(rate_limit['resetAt'])
+        with self._trava:
+            self.custo = max(float(rate_limit['cost']), 1.0)
+            self.limite = rate_limit['limit']
+            # Respostas da mesma janela podem chegar fora de ordem: fica com o menor saldo
+            if self.restante is None or self.reinicio != reinicio or rate_limit['remaining'] < self.restante:
+                self.restante = rate_limit['remaining']
+            self.reinicio = reinicio
+    
+    def registrar_cache(self, criada: Optional[float]):
+        """Registra o horário de uma página servida pelo cache, guardando o mais antigo"""
+        if criada is None:
+            return
+        with self._trava:
+            if self.cache_mais_antigo is None or criada < self.cache_mais_antigo:
+                self.cache_mais_antigo = criada
+    
+    def adiar(self, segundos: float):
+        """Impede que qualquer thread inicie uma requisição nos próximos segundos"""
+        with self._trava:
+            self._proxima = max(self._proxima, time.time() + segundos)
+
+
+def _agregar_arestas(n: int, origens: np.ndarray, destinos: np.ndarray,
+                     pesos: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Soma os pesos de arestas repetidas, devolvendo-as ordenadas por origem e destino"""
+    chaves, inverso = np.unique(origens.astype(np.int64) * n + destinos, return_inverse=True)
+    pesos = np.bincount(inverso.ravel(), weights=pesos, minlength=len(chaves))
+    return chaves // n, chaves % n, pesos
+
+
+def _mover_vertices(n: int, offsets: List[int], vizinhos: List[int], pesos: List[float],
+                    grau: List[float], m2: float, resolucao: float, rng: random.Random,
+                    max_iteracoes: int) -> Tuple[List[int], bool]:
+    """
+    Fase local do Louvain: move cada vértice para a comunidade vizinha de maior ganho
+    de modularidade até nenhum vértice mudar (ou max_iteracoes passadas)
+    
+    O total de grau de cada comunidade é mantido incrementalmente, então avaliar um
+    vértice custa O(grau) em vez de recalcular as comunidades vizinhas do zero.
+    
+    Returns:
+        Tupla (comunidade de cada vértice, se algum vértice mudou de comunidade)
+    """
+    comunidade = list(range(n))
+    total = list(grau)
+    ordem = list(range(n))
+    moveu = False
+    
+    for _ in range(max_iteracoes):
+        rng.shuffle(ordem)
+        movimentos = 0
+        for i in ordem:
+            atual = comunidade[i]
+            ligacoes = {}
+            for p in range(offsets[i], offsets[i + 1]):
+                j = vizinhos[p]
+                if j != i:
+                    c = comunidade[j]
+                    ligacoes[c] = ligacoes.get(c, 0.0) + pesos[p]
+            
+            # Retira o vértice da sua comunidade e escolhe a de maior ganho
+            total[atual] -= grau[i]
+            fator = resolucao * grau[i] / m2
+            melhor = atual
+            melhor_ganho = ligacoes.get(atual, 0.0) - fator * total[atual]
+            for c, peso in ligacoes.items():
+                ganho = peso - fator * total[c]
+                if ganho > melhor_ganho + 1e-12:
+                    melhor, melhor_ganho = c, ganho
+            total[melhor] += grau[i]
+            
+            if melhor != atual:
+                comunidade[i] = melhor
+                movimentos += 1
+        
+        if not movimentos:
+            break
+        moveu = True
+    
+    return comunidade, moveu
+
+
+def _louvain(n: int, origens: np.ndarray, destinos: np.ndarray, pesos: np.ndarray,
+             resolucao: float = 1.0, semente: Optional[int] = None,
+             max_iteracoes: int = 100, max_niveis: int = 32) -> Tuple[np.ndarray, float]:
+    """
+    Louvain multinível sobre arrays de arestas não direcionadas (cada ligação deve
+    aparecer nos dois sentidos; um laço de peso w conta como duas pontas)
+    
+    Cada nível executa a fase local e agrega as comunidades em super-vértices,
+    até que nenhum vértice mude de comunidade.
+    
+    Returns:
+        Tupla (comunidade de cada vértice, modularidade da partição)
+    """
+    membro = np.arange(n)
+    m2 = float(pesos.sum())
+    if m2 <= 0:
+        return membro, 0.0
+    
+    rng = random.Random(semente)
+    nivel_origens, nivel_destinos, nivel_pesos = _agregar_arestas(n, origens, destinos, pesos)
+    for _ in range(max_niveis):
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(nivel_origens, minlength=n), out=offsets[1:])
+        grau = np.bincount(nivel_origens, weights=nivel_pesos, minlength=n)
+        
+        comunidade, moveu = _mover_vertices(n, offsets.tolist(), nivel_destinos.tolist(),
+                                            nivel_pesos.tolist(), grau.tolist(), m2,
+                                            resolucao, rng, max_iteracoes)
+        if not moveu:
+            break
+        
+        # Renumera as comunidades e agrega o grafo para o próximo nível
+        _, comunidade = np.unique(comunidade, return_inverse=True)
+        comunidade = comunidade.ravel()
+        membro = comunidade[membro]
+        n = int(comunidade.max()) + 1
+        nivel_origens, nivel_destinos, nivel_pesos = _agregar_arestas(
+            n, comunidade[nivel_origens], comunidade[nivel_destinos], nivel_pesos)
+    
+    # Modularidade: soma de (peso interno - resolucao * total^2 / 2m) / 2m por comunidade
+    internos = membro[origens] == membro[destinos]
+    total = np.bincount(membro[origens], weights=pesos)
+    modularidade = (pesos[internos].sum() - resolucao * (total * total).sum() / m2) / m2
+    return membro, float(modularidade)
+
+
+def _pagerank(n: int, origens: np.ndarray, destinos: np.ndarray, pesos: np.ndarray,
+              amortecimento: float = 0.85, personalizacao: Optional[np.ndarray] = None,
+              inicial: Optional[np.ndarray] = None, tolerancia: float = 1e-10,
+              max_iteracoes: int = 100) -> Tuple[np.ndarray, int]:
+    """
+    PageRank ponderado por iteração de potência sobre arrays de arestas
+    
+    Cada iteração é um produto matriz esparsa-vetor feito com np.bincount, em O(E).
+    A massa dos vértices sem arestas de saída é redistribuída segundo a personalização.
+    
+    Returns:
+        Tupla (pontuação de cada vértice, somando 1; iterações executadas)
+    """
+    if n == 0:
+        return np.zeros(0), 0
+    forca = np.bincount(origens, weights=pesos, minlength=n)
+    transicao = np.divide(pesos, forca[origens], out=np.zeros(len(pesos)), where=forca[origens] > 0)
+    sem_saida = forca <= 0
+    
+    p = np.full(n, 1.0 / n) if personalizacao is None else personalizacao / personalizacao.sum()
+    x = p.copy() if inicial is None else inicial / inicial.sum()
+    
+    iteracoes = 0
+    for iteracoes in range(1, max_iteracoes + 1):
+        anterior = x
+        x = amortecimento * np.bincount(destinos, weights=transicao * anterior[origens], minlength=n)
+        x += (amortecimento * anterior[sem_saida].sum() + 1 - amortecimento) * p
+        if np.abs(x - anterior).sum() < tolerancia:
+            break
+    return x, iteracoes
+
+
+def _hits(n: int, origens: np.ndarray, destinos: np.ndarray, pesos: np.ndarray,
+          inicial: Optional[np.ndarray] = None, tolerancia: float = 1e-10,
+          max_iteracoes: int = 100) -> Tuple[np.ndarray, np.ndarray, int]:
+    """
+    HITS ponderado por iteração de potência sobre arrays de arestas
+    
+    Args:
+        inicial: Pontuações de hub de partida (warm start)
+        
+    Returns:
+        Tupla (hubs, autoridades, iterações executadas), com as pontuações somando 1
+    """
+    if n == 0:
+        return np.zeros(0), np.zeros(0), 0
+    hubs = np.full(n, 1.0 / n) if inicial is None else inicial / inicial.sum()
+    autoridades = np.zeros(n)
+    
+    iteracoes = 0
+    for iteracoes in range(1, max_iteracoes + 1):
+        autoridades = np.bincount(destinos, weights=pesos * hubs[origens], minlength=n)
+        autoridades /= autoridades.sum() or 1.0
+        novos = np.bincount(origens, weights=pesos * autoridades[destinos], minlength=n)
+        novos /= novos.sum() or 1.0
+        convergiu = np.abs(novos - hubs).sum() < tolerancia
+        hubs = novos
+        if convergiu:
+            break
+    return hubs, autoridades, iteracoes
+
+
+def _maiores(nomes: Sequence[str], valores: np.ndarray, k: int) -> List[Tuple[str, float]]:
+    """Retorna os k maiores valores (com os nomes), usando seleção parcial em vez de ordenar tudo"""
+    k = min(k, len(valores))
+    if k <= 0:
+        return []
+    indices = np.argpartition(-valores, k - 1)[:k]
+    indices = indices[np.argsort(-valores[indices], kind='stable')]
+    return [(nomes[i], float(valores[i])) for i in indices.tolist()]
+
+
+def _prever_ligacoes(offsets: np.ndarray, vizinhos: np.ndarray, fontes: Iterable[int], k: int,
+                     metrica: str = 'adamic_adar') -> Iterator[Tuple[int, np.ndarray, np.ndarray]]:
+    """
+    Pontua, para cada fonte, os vértices a dois passos que ainda não são seus vizinhos
+    
+    Os vizinhos dos vizinhos de cada fonte são reunidos de uma vez a partir do CSR
+    não direcionado (offsets/vizinhos) e as pontuações são somadas com np.bincount;
+    é o produto esparso A·A calculado linha a linha, sem materializar a matriz.
+    
+    Args:
+        metrica: 'vizinhos_comuns', 'jaccard' ou 'adamic_adar'
+        
+    Returns:
+        Gerador de (fonte, ids dos k melhores candidatos, pontuações), em ordem decrescente
+    """
+    grau = np.diff(offsets)
+    # Peso de cada vizinho comum z no Adamic-Adar: 1 / log(grau(z)); z com grau 1 não liga ninguém
+    ligam = grau > 1
+    peso_comum = np.zeros(len(grau))
+    np.log(grau, out=peso_comum, where=ligam)
+    np.divide(1.0, peso_comum, out=peso_comum, where=ligam)
+    
+    for u in fontes:
+        vizinhos_u = vizinhos[offsets[u]:offsets[u + 1]]
+        inicios = offsets[vizinhos_u]
+        tamanhos = grau[vizinhos_u]
+        total = int(tamanhos.sum())
+        if total == 0:
+            yield u, np.zeros(0, dtype=np.int64), np.zeros(0)
+            continue
+        
+        # Posições, em vizinhos, de todos os caminhos u -> z -> v
+        posicoes = np.repeat(inicios - np.cumsum(tamanhos) + tamanhos, tamanhos) + np.arange(total)
+        candidatos, inverso = np.unique(vizinhos[posicoes], return_inverse=True)
+        pesos = np.repeat(peso_comum[vizinhos_u], tamanhos) if metrica == 'adamic_adar' else None
+        pontuacao = np.bincount(inverso.ravel(), weights=pesos, minlength=len(candidatos)).astype(np.float64)
+        
+        # Descarta a própria fonte e quem já é vizinho
+        mantidos = (candidatos != u) & ~np.isin(candidatos, vizinhos_u, assume_unique=True)
+        candidatos = candidatos[mantidos]
+        pontuacao = pontuacao[mantidos]
+        if metrica == 'jaccard':
+            pontuacao /= grau[u] + grau[candidatos] - pontuacao
+        
+        # Seleção parcial dos k melhores; empates pelo menor id
+        if len(candidatos) > k:
+            limiar = np.partition(pontuacao, len(pontuacao) - k)[len(pontuacao) - k]
+            acima = pontuacao >= limiar
+            candidatos, pontuacao = candidatos[acima], pontuacao[acima]
+        ordem = np.lexsort((candidatos, -pontuacao))[:k]
+        yield u, candidatos[ordem], pontuacao[ordem]
+
+
+def _dijkstra_bidirecional(origem: str, destino: str, sucessores, predecessores) -> Tuple[List[str], float, int]:
+    """
+    Dijkstra bidirecional com custo 1/peso: uma busca a partir da origem pelas arestas
+    de saída e outra a partir do destino pelas arestas de entrada, expandindo a cada
+    passo o lado cujo topo do heap tem a menor distância, até que a soma dos topos
+    dos heaps supere o melhor caminho já encontrado
+    
+    Args:
+        sucessores: Função vértice -> lista de (vizinho de saída, peso)
+        predecessores: Função vértice -> lista de (vizinho de entrada, peso)
+        
+    Returns:
+        Tupla (caminho, custo, vértices definitivos), com caminho vazio e custo infinito
+        se o destino não é alcançável
+    """
+    if origem == destino:
+        return [origem], 0.0, 1
+    
+    infinito = float('inf')
+    distancias = ({origem: 0.0}, {destino: 0.0})
+    anteriores = ({origem: None}, {destino: None})
+    heaps = ([(0.0, origem)], [(0.0, destino)])
+    definitivos = (set(), set())
+    vizinhanca = (sucessores, predecessores)
+    melhor = infinito
+    encontro = None
+    
+    while heaps[0] and heaps[1] and heaps[0][0][0] + heaps[1][0][0] < melhor:
+        lado = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1
+        dist, corrente = heapq.heappop(heaps[lado])
+        if corrente in definitivos[lado]:
+            continue  # Entrada obsoleta do heap
+        definitivos[lado].add(corrente)
+        
+        distancias_lado, distancias_outro = distancias[lado], distancias[1 - lado]
+        for vizinho, peso in vizinhanca[lado](corrente):
+            if peso <= 0 or vizinho in definitivos[lado]:
+                continue
+            nova_dist = dist + 1 / peso
+            if nova_dist < distancias_lado.get(vizinho, infinito):
+                distancias_lado[vizinho] = nova_dist
+                anteriores[lado][vizinho] = corrente
+                heapq.heappush(heaps[lado], (nova_dist, vizinho))
+            if vizinho in distancias_outro:
+                total = distancias_lado[vizinho] + distancias_outro[vizinho]
+                if total < melhor:
+                    melhor = total
+                    encontro = vizinho
+    
+    explorados = len(definitivos[0]) + len(definitivos[1])
+    if encontro is None:
+        return [], infinito, explorados
+    
+    # Caminho: origem ... encontro pela busca direta, encontro ... destino pela reversa
+    caminho = []
+    v = encontro
+    while v is not None:
+        caminho.append(v)
+        v = anteriores[0][v]
+    caminho.reverse()
+    v = anteriores[1][encontro]
+    while v is not None:
+        caminho.append(v)
+        v = anteriores[1][v]
+    return caminho, melhor, explorados
+
+
 class SocialGraph:
-    def __init__(self, representation: str = 'matriz'):
+    METRICAS_LIGACAO = ('vizinhos_comuns', 'jaccard', 'adamic_adar')
+    MIN_VERTICES_PARALELO = 256  # Abaixo disso o pool de processos não compensa
+    AMOSTRAS_INICIAIS_BETWEENNESS = 64  # Primeira rodada do betweenness aproximado adaptativo
+    EPSILON_FRAGMENTACAO = 0.05  # Erro padrão do modo aproximado de fragmentação
+    
+    # Fluxos de paginação independentes (conexão, estados), cada um com o seu cursor
+    FLUXOS_COLETA = (
+        ('issues', ('OPEN',)),
+        ('issues', ('CLOSED',)),
+        ('pullRequests', ('OPEN',)),
+        ('pullRequests', ('CLOSED',)),
+        ('pullRequests', ('MERGED',)),
+    )
+    MAX_CONCORRENCIA = 4  # Requisições simultâneas à API
+    MAX_TENTATIVAS = 5  # Tentativas por página em falhas transitórias
+    ESPERA_BASE_TENTATIVA = 1.0  # Segundos; dobra a cada nova tentativa (com jitter)
+    ESPERA_MAXIMA_TENTATIVA = 60.0
+    FILA_MAXIMA_PAGINAS = 8  # Páginas processadas aguardando a inserção no grafo
+    TAMANHO_LOTE_NOS = 50  # Conexões aninhadas completadas por requisição (aliases node(id:))
+    
+    # Seleções de cada tipo de conexão aninhada nas consultas node(id:) em lote
+    _COMMENTS_PAGE = ('comments(first: 100, after: {cursor}) {{ '
+                      'pageInfo {{ hasNextPage endCursor }} nodes {{ author {{ login }} }} }}')
+    NESTED_SELECTIONS = {
+        'comments': ('... on Issue {{ ' + _COMMENTS_PAGE + ' }} '
+                     '... on PullRequest {{ ' + _COMMENTS_PAGE + ' }}'),
+        'reviews': ('... on PullRequest {{ reviews(first: 50, after: {cursor}) {{ '
+                    'pageInfo {{ hasNextPage endCursor }} nodes {{ id author {{ login }} '
+                    'comments(first: 50) {{ pageInfo {{ hasNextPage endCursor }} '
+                    'nodes {{ author {{ login }} }} }} }} }} }}'),
+        'review_comments': '... on PullRequestReview {{ ' + _COMMENTS_PAGE + ' }}',
+    }
+    CACHE_TTL = 24 * 3600  # Segundos em que uma página em cache continua válida
+    CACHE_MAX_BYTES = 512 * 1024 * 1024  # Tamanho máximo (comprimido) do cache
+    MAX_RESULTADOS_MEMO = 128  # Resultados de análises guardados (os menos usados saem primeiro)
+    
+    def __init__(self, representation: str = 'matriz', graphql_url: Optional[str] = None,
+                 max_concurrency: Optional[int] = None, cache_path: Optional[str] = None,
+                 offline: bool = False):
         """
         Initialize with choice of representation ('lista' or 'matriz')
+        
+        Args:
+            representation: 'lista' ou 'matriz'
+            graphql_url: Endpoint GraphQL (padrão: GITHUB_GRAPHQL_URL ou a API do GitHub);
+                permite apontar a coleta para um servidor local de testes
+            max_concurrency: Requisições simultâneas (padrão: MAX_CONCORRENCIA)
+            cache_path: Arquivo SQLite onde as páginas da API são guardadas
+                (padrão: GITHUB_CACHE; sem ele, nada é guardado)
+            offline: Usa apenas o cache, sem nenhuma requisição à API; o ttl é ignorado
+                e uma página ausente do cache é um erro
         """
         self.github_key = os.getenv('GITHUB_KEY')
         self.repositorio = os.getenv('REPOSITORIO')
         if not self.github_key or not self.repositorio:
             raise ValueError("Missing GitHub credentials in .env file")
         self.owner, self.repo = self._parse_repo_url()
-        self.graphql_url = 'https://api.github.com/graphql'
+        self.graphql_url = (graphql_url or os.getenv('GITHUB_GRAPHQL_URL')
+                            or 'https://api.github.com/graphql')
         self.headers = {
             'Authorization': f'Bearer {self.github_key}',
             'Content-Type': 'application/json'
         }
+        self.max_concurrency = max_concurrency or self.MAX_CONCORRENCIA
+        
+        # Sessão keep-alive compartilhada, com uma conexão por requisição simultânea
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_concurrency)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        
+        cache_path = cache_path or os.getenv('GITHUB_CACHE')
+        if offline and not cache_path:
+            raise ValueError("Offline mode requires a cache_path")
+        self.cache = _CachePaginas(cache_path, self.CACHE_TTL, self.CACHE_MAX_BYTES) if cache_path else None
+        self.offline = offline
+        
         self.representation = representation
         self.grafo = None
+        # Últimos resultados, usados como ponto de partida dos próximos cálculos
+        self._pagerank_anterior = None
+        self._hubs_anterior = None
+        # Resultados de análises da versão atual do grafo: (análise, parâmetros) -> resultado
+        self._resultados = OrderedDict()
+        self._grafo_resultados = None
+        self._versao_resultados = None
     
     def _parse_repo_url(self) -> tuple:
         """Extrai owner e nome do repositório da URL"""
         parts = self.repositorio.replace('https://github.com/', '').split('/')
         return parts[0], parts[1]
     
-    def _run_query(self, query: str, variables: Optional[Dict] = None) -> Dict:
-        """Executa uma consulta GraphQL"""
+    def _run_query(self, query: str, variables: Optional[Dict] = None, use_cache: bool = True) -> Dict:
+        """
+        Executa uma consulta GraphQL (ou a responde a partir do cache)
+        
+        Uma resposta vinda do cache traz em 'cachedAt' o horário (epoch) em que foi
+        guardada, para que a coleta saiba até quando os seus dados valem.
+        
+        Args:
+            use_cache: Se False, consulta sempre a API e não guarda a resposta
+                (atualizações incrementais precisam de dados novos)
+        """
+        cache_key = None
+        if self.cache is not None and use_cache:
+            cache_key = self.cache.chave(self.graphql_url, query, variables)
+            cached = self.cache.obter(cache_key, ignorar_ttl=self.offline)
+            if cached is not None:
+                data, created = cached
+                data['cachedAt'] = created
+                return data
+            if self.offline:
+                raise Exception("Page not found in cache (offline mode)")
+        
+        data = self._post_query(query, variables)
+        if cache_key is not None:
+            # O saldo do rate limit só vale no momento da resposta; não vai para o cache
+            self.cache.guardar(cache_key, {'data': {k: v for k, v in data['data'].items() if k != 'rateLimit'}})
+        return data
+    
+    def _post_query(self, query: str, variables: Optional[Dict] = None) -> Dict:
+        """Envia uma consulta GraphQL à API"""
         payload = {'query': query}
         if variables:
             payload['variables'] = variables
         
         try:
-            response = requests.post(
+            response = self.session.post(
                 self.graphql_url,
-                headers=self.headers,
                 data=json.dumps(payload),
                 timeout=10
             )
+            if response.status_code >= 500:
+                raise _ErroTransitorio(f"Server error: {response.status_code}")
+            if response.status_code in (403, 429) and (
+                    'Retry-After' in response.headers or 'rate limit' in response.text.lower()):
+                retry_after = response.headers.get('Retry-After')
+                raise _ErroTransitorio(f"Secondary rate limit: {response.status_code}",
+                                       float(retry_after) if retry_after else None)
             response.raise_for_status()
             data = response.json()
             
             if 'errors' in data:
                 error_msg = "\n".join([e['message'] for e in data['errors']])
+                if any(e.get('type') == 'RATE_LIMITED' for e in data['errors']):
+                    reset = response.headers.get('X-RateLimit-Reset')
+                    raise _ErroTransitorio(f"GraphQL errors: {error_msg}",
+                                           float(reset) - time.time() if reset else None)
                 raise Exception(f"GraphQL errors: {error_msg}")
             
             if 'data' not in data:
@@ -59,24 +863,40 @@ class SocialGraph:
                 
             return data
             
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            raise _ErroTransitorio(f"Request failed: {str(e)}")
         except requests.exceptions.RequestException as e:
             raise Exception(f"Request failed: {str(e)}")
     
-    def _get_issues_and_prs(self, cursor: Optional[str] = None) -> Dict:
-        """Obtém issues e PRs com paginação"""
+    def _get_issues(self, cursor: Optional[str] = None, states: Sequence[str] = ('OPEN', 'CLOSED'),
+                    since: Optional[str] = None, use_cache: bool = True) -> Dict:
+        """Obtém uma página de issues nos estados informados, atualizadas desde since"""
         query = """
-        query ($owner: String!, $repo: String!, $cursor: String) {
+        query ($owner: String!, $repo: String!, $cursor: String, $states: [IssueState!], $since: DateTime) {
+          rateLimit {
+            limit
+            cost
+            remaining
+            resetAt
+          }
           repository(owner: $owner, name: $repo) {
-            issues(first: 50, after: $cursor, orderBy: {field: CREATED_AT, direction: ASC}) {
+            issues(first: 50, after: $cursor, states: $states, filterBy: {since: $since},
+                   orderBy: {field: UPDATED_AT, direction: ASC}) {
               pageInfo {
                 hasNextPage
                 endCursor
               }
               nodes {
+                id
+                updatedAt
                 author {
                   login
                 }
                 comments(first: 50) {
+                  pageInfo {
+                    hasNextPage
+                    endCursor
+                  }
                   nodes {
                     author {
                       login
@@ -85,16 +905,53 @@ class SocialGraph:
                 }
               }
             }
-            pullRequests(first: 50, after: $cursor, orderBy: {field: CREATED_AT, direction: ASC}) {
+          }
+        }
+        """
+        variables = {
+            'owner': self.owner,
+            'repo': self.repo,
+            'cursor': cursor,
+            'states': list(states),
+            'since': since
+        }
+        return self._run_query(query, variables, use_cache)
+    
+    def _get_pull_requests(self, cursor: Optional[str] = None,
+                           states: Sequence[str] = ('OPEN', 'CLOSED', 'MERGED'),
+                           since: Optional[str] = None, use_cache: bool = True) -> Dict:
+        """
+        Obtém uma página de PRs nos estados informados, das mais recentemente atualizadas
+        para as mais antigas
+        
+        A conexão pullRequests não aceita filtro por data; quem pagina para ao
+        encontrar um PR atualizado antes de since.
+        """
+        query = """
+        query ($owner: String!, $repo: String!, $cursor: String, $states: [PullRequestState!]) {
+          rateLimit {
+            limit
+            cost
+            remaining
+            resetAt
+          }
+          repository(owner: $owner, name: $repo) {
+            pullRequests(first: 50, after: $cursor, states: $states, orderBy: {field: UPDATED_AT, direction: DESC}) {
               pageInfo {
                 hasNextPage
                 endCursor
               }
               nodes {
+                id
+                updatedAt
                 author {
                   login
                 }
                 comments(first: 50) {
+                  pageInfo {
+                    hasNextPage
+                    endCursor
+                  }
                   nodes {
                     author {
                       login
@@ -102,11 +959,20 @@ class SocialGraph:
                   }
                 }
                 reviews(first: 50) {
+                  pageInfo {
+                    hasNextPage
+                    endCursor
+                  }
                   nodes {
+                    id
                     author {
                       login
                     }
                     comments(first: 50) {
+                      pageInfo {
+                        hasNextPage
+                        endCursor
+                      }
                       nodes {
                         author {
                           login
@@ -123,13 +989,230 @@ class SocialGraph:
         variables = {
             'owner': self.owner,
             'repo': self.repo,
-            'cursor': cursor
+            'cursor': cursor,
+            'states': list(states)
         }
-        return self._run_query(query, variables)
+        return self._run_query(query, variables, use_cache)
+    
+    def _get_nested_pages(self, pending: Sequence[Tuple[str, str, Optional[str]]],
+                          use_cache: bool = True) -> Dict:
+        """
+        Busca numa única consulta a próxima página de várias conexões aninhadas
+        
+        Cada item vira um alias node(id:) da consulta, então completar muitas
+        conversas longas custa uma requisição por lote, não uma por conversa.
+        
+        Args:
+            pending: Itens (tipo, id do nó, cursor), com tipo 'comments' (issue/PR),
+                'reviews' (PR) ou 'review_comments' (review)
+        """
+        declarations = []
+        selections = []
+        variables = {}
+        for k, (kind, node_id, cursor) in enumerate(pending):
+            declarations.append(f"$id{k}: ID!, $cursor{k}: String")
+            selections.append(f"n{k}: node(id: $id{k}) {{ {self.NESTED_SELECTIONS[kind].format(cursor=f'$cursor{k}')} }}")
+            variables[f'id{k}'] = node_id
+            variables[f'cursor{k}'] = cursor
+        
+        query = (f"query ({', '.join(declarations)}) {{\n"
+                 "  rateLimit { limit cost remaining resetAt }\n  "
+                 + "\n  ".join(selections) + "\n}")
+        return self._run_query(query, variables, use_cache)
+    
+    @staticmethod
+    def _pending_nested(nodes: Iterable[Dict]) -> List[Tuple[str, str, Dict]]:
+        """Lista as conexões aninhadas (comentários, reviews) que ainda têm páginas a buscar"""
+        pending = []
+        for node in nodes:
+            if node['comments']['pageInfo']['hasNextPage']:
+                pending.append(('comments', node['id'], node['comments']))
+            reviews = node.get('reviews')
+            if reviews is None:
+                continue
+            if reviews['pageInfo']['hasNextPage']:
+                pending.append(('reviews', node['id'], reviews))
+            for review in reviews['nodes']:
+                if review['comments']['pageInfo']['hasNextPage']:
+                    pending.append(('review_comments', review['id'], review['comments']))
+        return pending
+    
+    def _complete_nested(self, nodes: List[Dict], agendador: _AgendadorRequisicoes,
+                         use_cache: bool = True) -> bool:
+        """
+        Completa, em lotes, os comentários e reviews que não couberam na primeira página
+        
+        As páginas buscadas são anexadas aos próprios nós. Se o máximo de páginas for
+        atingido, as conversas restantes ficam truncadas.
+        
+        Returns:
+            True se todas as conversas foram completadas
+        """
+        pending = self._pending_nested(nodes)
+        while pending:
+            batch, pending = pending[:self.TAMANHO_LOTE_NOS], pending[self.TAMANHO_LOTE_NOS:]
+            request_number = agendador.reservar()
+            if request_number is None:
+                print(f"Limite de páginas atingido; {len(batch) + len(pending)} conversas ficaram incompletas")
+                return False
+            print(f"Realizando requisição {request_number} (continuação de {len(batch)} conversas)...")
+            
+            data = self._fetch_page(agendador, self._get_nested_pages,
+                                    [(kind, node_id, connection['pageInfo']['endCursor'])
+                                     for kind, node_id, connection in batch], use_cache)
+            for k, (kind, node_id, connection) in enumerate(batch):
+                result = data['data'].get(f'n{k}')
+                if not result:
+                    continue  # Nó removido entre as requisições
+                fetched = result['reviews' if kind == 'reviews' else 'comments']
+                connection['nodes'].extend(fetched['nodes'])
+                connection['pageInfo'] = fetched['pageInfo']
+                if fetched['pageInfo']['hasNextPage']:
+                    pending.append((kind, node_id, connection))
+                if kind == 'reviews':
+                    for review in fetched['nodes']:
+                        if review['comments']['pageInfo']['hasNextPage']:
+                            pending.append(('review_comments', review['id'], review['comments']))
+        return True
+    
+    def _fetch_page(self, agendador: _AgendadorRequisicoes, fetch, *args) -> Dict:
+        """
+        Busca uma página, repetindo falhas transitórias com backoff exponencial e jitter
+        
+        A primeira tentativa já foi reservada por quem chama; cada nova tentativa reserva
+        de novo a sua vez no agendador, respeitando o ritmo das demais threads. O
+        Retry-After informado pela API adia todas as threads de coleta.
+        """
+        for tentativa in range(self.MAX_TENTATIVAS):
+            if tentativa:
+                agendador.reservar(nova_pagina=False)
+            try:
+                data = fetch(*args)
+                agendador.registrar(data['data'].get('rateLimit'))
+                agendador.registrar_cache(data.get('cachedAt'))
+                return data
+            except _ErroTransitorio as e:
+                if tentativa == self.MAX_TENTATIVAS - 1:
+                    raise
+                if e.espera is not None:
+                    # A reserva da próxima tentativa aguarda o fim do adiamento
+                    espera = max(e.espera, 0.0)
+                    agendador.adiar(espera)
+                    print(f"{str(e)}; nova tentativa em {espera:.1f}s")
+                else:
+                    espera = random.uniform(0, min(self.ESPERA_MAXIMA_TENTATIVA,
+                                                   self.ESPERA_BASE_TENTATIVA * 2 ** tentativa))
+                    print(f"{str(e)}; nova tentativa em {espera:.1f}s")
+                    time.sleep(espera)
     
-    def _process_interactions(self, data: Dict) -> Dict[str, Dict[str, int]]:
+    def _fetch_stream(self, connection: str, states: Sequence[str], agendador: _AgendadorRequisicoes,
+                      sink: queue.Queue, cancel: threading.Event, since: Optional[str] = None,
+                      use_cache: bool = True) -> bool:
         """
-        Processa os dados da API e retorna um dicionário de interações
+        Percorre as páginas de uma conexão (issues ou PRs) com cursor próprio,
+        entregando ao sink, página a página, as interações de cada issue/PR
+        
+        Como o sink é limitado, a coleta espera quando o consumidor fica para trás.
+        Ao terminar (ou ao ser cancelado) o fluxo entrega None. No modo offline, uma
+        página que não está no cache interrompe todos os fluxos com erro.
+        
+        Args:
+            since: Se informado, só considera issues/PRs atualizados a partir deste horário
+            use_cache: Se False, ignora o cache de páginas
+            
+        Returns:
+            True se o fluxo chegou ao fim sem erros nem truncamento (limite de páginas
+            ou cancelamento)
+        """
+        fetch = self._get_issues if connection == 'issues' else self._get_pull_requests
+        cursor = None
+        complete = False
+        nested_complete = True
+        
+        try:
+            while not cancel.is_set():
+                request_number = agendador.reservar()
+                if request_number is None:
+                    break
+                print(f"Realizando requisição {request_number} ({connection} {'/'.join(states)})...")
+                
+                try:
+                    data = self._fetch_page(agendador, fetch, cursor, states, since, use_cache)
+                    page = data['data']['repository'][connection]
+                    # Só os nós atualizados desde since têm as conversas completadas
+                    nodes = page['nodes']
+                    if since is not None:
+                        nodes = [node for node in nodes if node['updatedAt'] >= since]
+                    reached_since = len(nodes) < len(page['nodes'])
+                    if not self._complete_nested(nodes, agendador, use_cache):
+                        nested_complete = False
+                    threads = [(node['id'], self._node_interactions(node)) for node in nodes]
+                except Exception as e:
+                    if self.offline:
+                        # Sem a API, uma página ausente do cache deixaria o grafo incompleto
+                        cancel.set()
+                        raise
+                    print(f"Erro durante a coleta de dados ({connection}): {str(e)}")
+                    break
+                
+                sink.put(threads)
+                if reached_since or not page['pageInfo']['hasNextPage']:
+                    complete = nested_complete
+                    break
+                cursor = page['pageInfo']['endCursor']
+        finally:
+            sink.put(None)
+        return complete
+    
+    def _stream_threads(self, max_pages: Optional[int] = None, since: Optional[str] = None,
+                        use_cache: bool = True, unfinished: Optional[List[str]] = None,
+                        cached: Optional[List[float]] = None
+                        ) -> Iterator[Tuple[str, Dict[str, Dict[str, int]]]]:
+        """
+        Executa os fluxos de coleta em paralelo e gera (id do nó, interações) de cada
+        issue/PR assim que a sua página chega
+        
+        No máximo FILA_MAXIMA_PAGINAS páginas processadas ficam aguardando o consumidor.
+        
+        Args:
+            unfinished: Se informada, recebe ao final os fluxos que não chegaram ao fim
+                (erro, limite de páginas ou conversas truncadas)
+            cached: Se informada, recebe ao final o horário (epoch) em que foi guardada
+                a página mais antiga servida pelo cache, se alguma foi
+        """
+        agendador = _AgendadorRequisicoes(max_pages)
+        sink = queue.Queue(maxsize=self.FILA_MAXIMA_PAGINAS)
+        cancel = threading.Event()
+        
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(self.FLUXOS_COLETA))) as pool:
+            streams = [pool.submit(self._fetch_stream, connection, states, agendador, sink, cancel,
+                                   since, use_cache)
+                       for connection, states in self.FLUXOS_COLETA]
+            finished = 0
+            try:
+                while finished < len(streams):
+                    threads = sink.get()
+                    if threads is None:
+                        finished += 1
+                        continue
+                    yield from threads
+            finally:
+                # Se o consumidor parar antes, libera os fluxos bloqueados no sink
+                cancel.set()
+                while finished < len(streams):
+                    if sink.get() is None:
+                        finished += 1
+            for (connection, states), stream in zip(self.FLUXOS_COLETA, streams):
+                if not stream.result() and unfinished is not None:
+                    unfinished.append(f"{connection} {'/'.join(states)}")
+            if agendador.cache_mais_antigo is not None and cached is not None:
+                cached.append(agendador.cache_mais_antigo)
+    
+    def _node_interactions(self, node: Dict) -> Dict[str, Dict[str, int]]:
+        """
+        Retorna as interações de uma única issue ou PR (autor com comentaristas e revisores)
+        
+        Cada interação é registrada nos dois sentidos, com o mesmo peso.
         """
         interactions = {}
         
@@ -149,123 +1232,292 @@ class SocialGraph:
             interactions[source_login][target_login] = interactions[source_login].get(target_login, 0) + weight
         
         try:
-            repo_data = data['data']['repository']
+            author = node.get('author')
+            if not author:
+                return interactions
             
-            # Process issues
-            for issue in repo_data['issues']['nodes']:
-                author = issue.get('author')
-                if not author:
-                    continue
-                
-                for comment in issue['comments']['nodes']:
-                    comment_author = comment.get('author')
-                    add_interaction(author, comment_author)
-                    add_interaction(comment_author, author)
-            
-            # Process PRs
-            for pr in repo_data['pullRequests']['nodes']:
-                author = pr.get('author')
-                if not author:
+            # Issue/PR comments
+            for comment in node['comments']['nodes']:
+                comment_author = comment.get('author')
+                add_interaction(author, comment_author)
+                add_interaction(comment_author, author)
+            
+            # PR reviews and review comments
+            for review in node.get('reviews', {'nodes': []})['nodes']:
+                review_author = review.get('author')
+                if not review_author:
                     continue
                 
-                # PR comments
-                for comment in pr['comments']['nodes']:
-                    comment_author = comment.get('author')
-                    add_interaction(author, comment_author)
-                    add_interaction(comment_author, author)
+                add_interaction(author, review_author, 2)
+                add_interaction(review_author, author, 2)
                 
-                # PR reviews and review comments
-                for review in pr['reviews']['nodes']:
-                    review_author = review.get('author')
-                    if not review_author:
-                        continue
-                    
-                    add_interaction(author, review_author, 2)
-                    add_interaction(review_author, author, 2)
-                    
-                    for review_comment in review['comments']['nodes']:
-                        review_comment_author = review_comment.get('author')
-                        add_interaction(author, review_comment_author)
-                        add_interaction(review_comment_author, author)
+                for review_comment in review['comments']['nodes']:
+                    review_comment_author = review_comment.get('author')
+                    add_interaction(author, review_comment_author)
+                    add_interaction(review_comment_author, author)
             
             return interactions
             
         except KeyError as e:
             raise Exception(f"Missing expected data field: {str(e)}")
     
-    def build_graph(self, min_interactions: int = 50):
-        """Constrói o grafo social com representação escolhida"""
-        print(f"Iniciando construção do grafo social ({self.representation})...")
+    @staticmethod
+    def _utc_now(timestamp: Optional[float] = None) -> str:
+        """
+        Horário atual (ou o do timestamp epoch informado) no formato ISO 8601 usado pela
+        API (ex.: 2024-01-01T00:00:00Z)
+        """
+        instant = datetime.now(timezone.utc) if timestamp is None else datetime.fromtimestamp(timestamp, timezone.utc)
+        return instant.strftime('%Y-%m-%dT%H:%M:%SZ')
+    
+    def _is_active(self, user: str) -> bool:
+        """Indica se um usuário passa pelo filtro de interações mínimas"""
+        if self.min_interactions > 0:
+            return self.user_activity.get(user, 0) >= self.min_interactions
+        return self.user_activity.get(user, 0) > 0 or self.received.get(user, 0) > 0
+    
+    def build_graph(self, min_interactions: int = 50, max_pages: Optional[int] = None):
+        """
+        Constrói o grafo social com representação escolhida
         
-        all_interactions = {}
-        cursor = None
-        has_next_page = True
-        request_count = 0
+        A coleta, o processamento das páginas e a inserção no grafo acontecem em
+        paralelo: cada issue/PR é aplicado ao grafo assim que a sua página chega, e
+        os contadores de atividade decidem na hora quem passa pelo filtro.
         
-        while has_next_page and request_count < 30:
-            request_count += 1
-            print(f"Realizando requisição {request_count}...")
-            
-            try:
-                data = self._get_issues_and_prs(cursor)
-                batch_interactions = self._process_interactions(data)
-                
-                for user, interactions in batch_interactions.items():
-                    if user not in all_interactions:
-                        all_interactions[user] = {}
-                    for target, weight in interactions.items():
-                        all_interactions[user][target] = all_interactions[user].get(target, 0) + weight
-                
-                issues_page_info = data['data']['repository']['issues']['pageInfo']
-                has_next_page = issues_page_info['hasNextPage']
-                cursor = issues_page_info['endCursor']
-                
-                time.sleep(1.5)
-                
-            except Exception as e:
-                print(f"Erro durante a coleta de dados: {str(e)}")
-                break
+        Se a coleta não chegar ao fim (erro ou max_pages), não há horário de
+        sincronização e o próximo refresh_graph busca todo o histórico de novo. Se
+        páginas vierem do cache, o horário de sincronização é o da página mais antiga
+        usada, para que o refresh_graph busque tudo o que mudou desde então.
+        
+        Args:
+            min_interactions: Interações mínimas para um usuário entrar no grafo
+            max_pages: Máximo de páginas buscadas no total (padrão: todas)
+        """
+        print(f"Iniciando construção do grafo social ({self.representation})...")
         
         # Create graph with chosen representation
         self.grafo = Grafo(representacao=self.representation)
+        self.min_interactions = min_interactions
+        self.user_activity = defaultdict(int)
+        self.received = defaultdict(int)
+        # Interações de cada issue/PR (em disco): registro bruto de todas as interações,
+        # para que refresh_graph aplique só a diferença e rethreshold refaça o grafo
+        if getattr(self, 'thread_interactions', None) is not None:
+            self.thread_interactions.fechar()
+        self.thread_interactions = _RegistroInteracoes()
+        self._interaction_store = None
         
-        # Collect all users and filter by activity
-        all_users = set()
-        user_activity = {}
+        self.last_sync = None
         
-        for source, targets in all_interactions.items():
-            total = sum(targets.values())
-            user_activity[source] = total
-            all_users.add(source)
-            all_users.update(targets.keys())
+        sync_start = self._utc_now()
+        unfinished = []
+        cached = []
+        for thread_id, interactions in self._stream_threads(max_pages, unfinished=unfinished, cached=cached):
+            self._apply_thread(thread_id, interactions)
+        if unfinished:
+            print(f"Coleta incompleta ({', '.join(unfinished)})")
+        elif cached:
+            # Os dados só valem até quando a página mais antiga do cache foi guardada
+            self.last_sync = self._utc_now(cached[0])
+        else:
+            self.last_sync = sync_start
         
-        # Filter users by minimum interactions
         if min_interactions > 0:
-            active_users = {u for u in all_users if user_activity.get(u, 0) >= min_interactions}
-            print(f"Filtrando {len(active_users)} usuários ativos (≥ {min_interactions} interações)")
+            print(f"Filtrando {self.grafo.quantidade_vertices()} usuários ativos (≥ {min_interactions} interações)")
+        print("\nGrafo social construído com sucesso!")
+        print(f"Total de usuários: {self.grafo.quantidade_vertices()}")
+        print(f"Total de interações: {self.grafo.quantidade_arestas()}\n")
+    
+    def refresh_graph(self, max_pages: Optional[int] = None) -> Dict[str, int]:
+        """
+        Atualiza o grafo com as issues e PRs modificados desde a última sincronização
+        
+        Só as issues/PRs atualizados desde então são buscados; as interações antigas de
+        cada um são substituídas pelas novas e apenas a diferença é aplicada ao grafo
+        existente, sem reconstruí-lo. As páginas vêm sempre da API, nunca do cache.
+        
+        O horário de sincronização só avança se todos os fluxos chegarem ao fim; depois
+        de uma coleta incompleta (erro ou max_pages), a próxima busca de novo a partir
+        do mesmo horário. Sem horário (construção incompleta), todo o histórico é buscado.
+        
+        Args:
+            max_pages: Máximo de páginas buscadas no total (padrão: todas)
+            
+        Returns:
+            Dicionário com a quantidade de issues/PRs atualizados, usuários adicionados
+            e removidos, arestas distintas cujo peso ou presença mudou e fluxos que não
+            chegaram ao fim
+        """
+        if self.grafo is None or getattr(self, 'user_activity', None) is None:
+            raise Exception("Grafo não construído")
+        if self.offline:
+            raise Exception("refresh_graph requires API access (offline mode)")
+        
+        if self.last_sync is None:
+            print("Última coleta incompleta; buscando todas as issues e PRs...")
+        else:
+            print(f"Buscando issues e PRs atualizados desde {self.last_sync}...")
+        sync_start = self._utc_now()
+        summary = {'threads': 0, 'users_added': 0, 'users_removed': 0}
+        unfinished = []
+        # Peso de cada aresta tocada antes da atualização (None se não existia)
+        edges_before = {}
+        for thread_id, interactions in self._stream_threads(max_pages, since=self.last_sync, use_cache=False,
+                                                            unfinished=unfinished):
+            for key, count in self._apply_thread(thread_id, interactions, edges_before).items():
+                summary[key] += count
+            summary['threads'] += 1
+        weights = self.grafo.pesos_arestas
+        summary['edges_changed'] = sum(1 for edge, weight in edges_before.items() if weights.get(edge) != weight)
+        summary['unfinished_streams'] = len(unfinished)
+        if unfinished:
+            print(f"Coleta incompleta ({', '.join(unfinished)}); a próxima atualização repete o período")
         else:
-            active_users = all_users
+            self.last_sync = sync_start
         
-        # Add vertices (filtered users)
-        for user in active_users:
-            total_interactions = sum(all_interactions.get(user, {}).values()) + \
-                                sum(v.get(user, 0) for v in all_interactions.values())
-            self.grafo.adicionar_vertice(user, peso=total_interactions, rotulo=user)
+        print(f"Grafo atualizado: {summary['threads']} issues/PRs, "
+              f"{summary['users_added']} usuários adicionados, {summary['users_removed']} removidos, "
+              f"{summary['edges_changed']} arestas alteradas")
+        return summary
+    
+    def _apply_thread(self, thread_id: str, interactions: Dict[str, Dict[str, int]],
+                      edges_before: Optional[Dict[Tuple[str, str], Optional[float]]] = None) -> Dict[str, int]:
+        """Substitui as interações registradas de uma issue/PR, aplicando a diferença ao grafo"""
+        return self._apply_interaction_deltas(self.thread_interactions.substituir(thread_id, interactions),
+                                              edges_before)
+    
+    def _activate_user(self, user: str) -> List[Tuple[str, str, int]]:
+        """
+        Insere no grafo um usuário que passou pelo filtro, com as suas interações
+        registradas (em todas as conversas) com usuários que já estão no grafo
         
-        # Add edges (filtered interactions)
-        for source, targets in all_interactions.items():
-            if source not in active_users:
-                continue
-            for target, weight in targets.items():
-                if target in active_users:
-                    self.grafo.adicionar_aresta(source, target, peso=weight)
+        Returns:
+            Arestas criadas (origem, destino, peso)
+        """
+        self.grafo.adicionar_vertice(user, rotulo=user)
+        made, received = self.thread_interactions.interacoes_usuario(user)
+        vertices = self.grafo.vertices
+        edges = [(user, target, weight) for target, weight in made.items() if target in vertices]
+        edges.extend((source, user, weight) for source, weight in received.items() if source in vertices)
+        self.grafo.adicionar_arestas(edges)
+        return edges
+    
+    def _apply_interaction_deltas(self, delta: Dict[str, Dict[str, int]],
+                                  edges_before: Optional[Dict[Tuple[str, str], Optional[float]]] = None
+                                  ) -> Dict[str, int]:
+        """
+        Aplica variações de peso das interações aos contadores e ao grafo existente
         
-        print("\nGrafo social construído com sucesso!")
-        print(f"Total de usuários: {self.grafo.quantidade_vertices()}")
-        print(f"Total de interações: {self.grafo.quantidade_arestas()}\n")
+        Args:
+            edges_before: Se informado, recebe o peso anterior (None se ausente) de cada
+                aresta tocada pela primeira vez, para contar ao final as que mudaram
+        """
+        self._interaction_store = None
+        affected = set()
+        weights = self.grafo.pesos_arestas
+        
+        def touch(edge):
+            if edges_before is not None and edge not in edges_before:
+                edges_before[edge] = weights.get(edge)
+        
+        for source, targets in delta.items():
+            for target, change in targets.items():
+                if not change:
+                    continue
+                affected.add(source)
+                affected.add(target)
+                self.user_activity[source] += change
+                self.received[target] += change
+                
+                if source in self.grafo.vertices and target in self.grafo.vertices:
+                    touch((source, target))
+                    weight = weights.get((source, target), 0) + change
+                    if weight:
+                        self.grafo.adicionar_aresta(source, target, weight)
+                    else:
+                        self.grafo.remover_aresta(source, target)
         
+        # Usuários que entram ou saem do filtro de interações mínimas
+        added = 0
+        removed = 0
+        for user in affected:
+            active = self._is_active(user)
+            if active and user not in self.grafo.vertices:
+                for source, target, _ in self._activate_user(user):
+                    # Arestas novas: ausentes antes, a não ser que já tenham sido tocadas
+                    if edges_before is not None:
+                        edges_before.setdefault((source, target), None)
+                added += 1
+            elif not active and user in self.grafo.vertices:
+                if edges_before is not None:
+                    for target in self.grafo.obter_vizinhos(user):
+                        touch((user, target))
+                    for source in self.grafo.obter_predecessores(user):
+                        touch((source, user))
+                # As interações continuam no registro e voltam se o usuário reativar
+                self.grafo.remover_vertice(user)
+                removed += 1
+        for user in affected:
+            if user in self.grafo.vertices:
+                self.grafo.definir_peso_vertice(user, self.user_activity[user] + self.received[user])
         
+        return {'users_added': added, 'users_removed': removed}
+    
+    def interaction_store(self) -> GrafoCSR:
+        """
+        Retorna todas as interações coletadas, sem o filtro de min_interactions, como
+        um snapshot CSR compacto (reconstruído apenas quando as interações mudam)
+        
+        As interações vêm do registro de conversas, não do grafo, então remoções feitas
+        pelas análises (remover_maior_fragmentador, campanha_fragmentacao) não as
+        afetam. O peso de cada vértice é o total de interações feitas e recebidas. O
+        snapshot pode ser salvo com salvar_binario e filtrado sem cópias com filtrar.
+        """
+        if getattr(self, 'user_activity', None) is None:
+            raise Exception("Grafo não construído")
+        if self._interaction_store is not None:
+            return self._interaction_store
+        
+        users = sorted(u for u in set(self.user_activity) | set(self.received)
+                       if self.user_activity[u] or self.received[u])
+        ids = {u: i for i, u in enumerate(users)}
+        origins = []
+        targets = []
+        weights = []
+        for source, target, weight in self.thread_interactions.agregadas():
+            origins.append(ids[source])
+            targets.append(ids[target])
+            weights.append(weight)
+        
+        origins = np.asarray(origins, dtype=np.int64)
+        targets = np.asarray(targets, dtype=np.int64)
+        order = np.lexsort((targets, origins))
+        offsets = np.zeros(len(users) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(origins, minlength=len(users)), out=offsets[1:])
+        
+        self._interaction_store = GrafoCSR(
+            users, offsets, targets[order], np.asarray(weights, dtype=np.float64)[order],
+            pesos_vertices=[self.user_activity[u] + self.received[u] for u in users],
+            rotulos_vertices=users, representacao=self.representation)
+        return self._interaction_store
+    
+    def rethreshold(self, min_interactions: int):
+        """
+        Reconstrói o grafo com outro min_interactions a partir das interações já
+        coletadas, sem acessar a API (usuários removidos pelas análises voltam)
+        
+        Para só explorar limiares (contar usuários e interações), prefira
+        interaction_store().filtrar(forca_minima=...), que não materializa nada.
+        """
+        store = self.interaction_store()
+        view = store.filtrar(forca_minima=min_interactions if min_interactions > 0 else None)
+        
+        self.grafo = view.para_grafo(self.representation)
+        self.min_interactions = min_interactions
         
+        print(f"Grafo refeito com min_interactions={min_interactions}: "
+              f"{self.grafo.quantidade_vertices()} usuários, {self.grafo.quantidade_arestas()} interações")
+    
     def run_analysis_menu(self):
         """Menu interativo para análise do grafo social"""
         if self.grafo is None or self.grafo.quantidade_vertices() == 0:
@@ -306,10 +1558,10 @@ class SocialGraph:
     
     def show_most_influential(self):
         """Mostra os 5 usuários mais influentes"""
-        top_users = self.usuarios_mais_influentes()
-        print("\nTop 5 usuários mais influentes:")
+        top_users = self.usuarios_mais_influentes(metodo='pagerank')
+        print("\nTop 5 usuários mais influentes (PageRank):")
         for i, (user, score) in enumerate(top_users, 1):
-            print(f"{i}. {user} (influência: {score})")
+            print(f"{i}. {user} (influência: {score:.4f})")
     
     def handle_fragmentation(self):
         """Identifica e remove o vértice que causa maior fragmentação"""
@@ -319,8 +1571,9 @@ class SocialGraph:
     
     def show_natural_groups(self):
         """Mostra os grupos naturais identificados"""
-        grupos = self.grupos_naturais()
-        print("\nGrupos naturais identificados:")
+        particao, modularidade = self.detectar_comunidades()
+        grupos = self._maiores_grupos(particao, 3)
+        print(f"\nGrupos naturais identificados (modularidade: {modularidade:.4f}):")
         for i, grupo in enumerate(grupos, 1):
             print(f"\nGrupo {i} ({len(grupo)} membros):")
             print(", ".join(sorted(grupo)))
@@ -380,146 +1633,499 @@ class SocialGraph:
         
         self.grafo.plotar()
     
-    def usuarios_mais_influentes(self, top_n: int = 5) -> List[tuple[str, int]]:
+    def _memorizado(self, chave: tuple, calcular, *args):
+        """
+        Retorna o resultado guardado da análise ou o calcula e guarda
+        
+        Os resultados valem para uma versão do grafo: qualquer alteração nele (ou a
+        troca do grafo) descarta todos. Acima de MAX_RESULTADOS_MEMO, sai o resultado
+        usado há mais tempo.
+        
+        Args:
+            chave: Tupla (análise, parâmetros...) com valores hasheáveis
+            calcular: Função chamada com args quando o resultado não está guardado
+        """
+        if self._grafo_resultados is not self.grafo or self._versao_resultados != self.grafo.versao:
+            self._resultados.clear()
+            self._grafo_resultados = self.grafo
+            self._versao_resultados = self.grafo.versao
+        
+        if chave in self._resultados:
+            self._resultados.move_to_end(chave)
+            return self._resultados[chave]
+        
+        resultado = calcular(*args)
+        self._resultados[chave] = resultado
+        if len(self._resultados) > self.MAX_RESULTADOS_MEMO:
+            self._resultados.popitem(last=False)
+        return resultado
+    
+    def usuarios_mais_influentes(self, top_n: int = 5, metodo: str = 'forca',
+                                 personalizacao: Optional[Dict[str, float]] = None) -> List[tuple[str, float]]:
         """
-        Retorna os usuários mais influentes baseado no grau de saída ponderado
+        Retorna os usuários mais influentes
+        
+        O resultado é guardado até a próxima alteração do grafo.
+        
+        Args:
+            top_n: Quantidade de usuários retornados
+            metodo: 'forca' (grau de saída ponderado), 'pagerank' (alcance indireto),
+                'hubs' ou 'autoridades' (HITS)
+            personalizacao: No PageRank, peso de teleporte de cada usuário
         """
         if self.grafo is None:
             raise Exception("Grafo não construído")
         
-        influencia = []
-        for v in self.grafo.vertices:
-            grau_saida = 0
-            if self.grafo.representacao == 'lista':
-                for (vizinho, peso) in self.grafo.estrutura.get(v, []):
-                    grau_saida += peso
-            else:
-                if not self.grafo._matriz_atualizada:
-                    self.grafo._atualizar_matriz()
-                idx = self.grafo._vertex_index[v]
-                grau_saida = sum(self.grafo.estrutura[idx])
+        chave = ('influentes', top_n, metodo,
+                 frozenset(personalizacao.items()) if personalizacao is not None else None)
+        return list(self._memorizado(chave, self._usuarios_mais_influentes, top_n, metodo, personalizacao))
+    
+    def _usuarios_mais_influentes(self, top_n: int, metodo: str,
+                                  personalizacao: Optional[Dict[str, float]]) -> List[tuple[str, float]]:
+        """Calcula os usuários mais influentes (ver usuarios_mais_influentes)"""
+        if metodo == 'forca':
+            influencia = ((v, self.grafo.forca_saida(v)) for v in self.grafo.vertices)
+            return heapq.nlargest(top_n, influencia, key=lambda x: x[1])
+        if metodo == 'pagerank':
+            pontuacao = self.pagerank(personalizacao=personalizacao, inicial=self._pagerank_anterior)
+            if personalizacao is None:
+                self._pagerank_anterior = pontuacao
+        elif metodo in ('hubs', 'autoridades'):
+            hubs, autoridades = self.hits(inicial=self._hubs_anterior)
+            self._hubs_anterior = hubs
+            pontuacao = hubs if metodo == 'hubs' else autoridades
+        else:
+            raise ValueError(f"Método de influência inválido: {metodo}")
+        
+        nomes = list(pontuacao)
+        return _maiores(nomes, np.fromiter(pontuacao.values(), dtype=np.float64, count=len(nomes)), top_n)
+    
+    def _vetor_inicial(self, csr: GrafoCSR, valores: Optional[Dict[str, float]]) -> Optional[np.ndarray]:
+        """Converte pontuações por nome em vetor do snapshot (vértices ausentes recebem a média)"""
+        if not valores:
+            return None
+        vetor = np.fromiter((valores.get(v, np.nan) for v in csr.nomes), dtype=np.float64,
+                            count=csr.quantidade_vertices())
+        conhecidos = ~np.isnan(vetor)
+        if not conhecidos.any() or vetor[conhecidos].sum() <= 0:
+            return None
+        vetor[~conhecidos] = vetor[conhecidos].mean()
+        return vetor
+    
+    def pagerank(self, amortecimento: float = 0.85, personalizacao: Optional[Dict[str, float]] = None,
+                 inicial: Optional[Dict[str, float]] = None, tolerancia: float = 1e-10,
+                 max_iteracoes: int = 100) -> Dict[str, float]:
+        """
+        Calcula o PageRank ponderado pelas interações (iteração de potência vetorizada)
+        
+        Args:
+            amortecimento: Probabilidade de seguir uma interação em vez de teleportar
+            personalizacao: Peso de teleporte de cada usuário (padrão: uniforme)
+            inicial: Resultado anterior usado como ponto de partida (warm start)
+            tolerancia: Variação total (L1) abaixo da qual a iteração para
+            max_iteracoes: Máximo de iterações
             
-            influencia.append((v, grau_saida))
+        Returns:
+            Dicionário usuário -> pontuação (soma 1)
+        """
+        if self.grafo is None:
+            raise Exception("Grafo não construído")
         
-        return sorted(influencia, key=lambda x: x[1], reverse=True)[:top_n]
+        csr = self.grafo.snapshot_csr()
+        p = None
+        if personalizacao is not None:
+            p = np.fromiter((personalizacao.get(v, 0.0) for v in csr.nomes), dtype=np.float64,
+                            count=csr.quantidade_vertices())
+            if p.sum() <= 0:
+                raise ValueError("Personalização sem nenhum usuário do grafo")
+        
+        pontuacao, _ = _pagerank(csr.quantidade_vertices(), csr.origens(), csr.destinos, csr.pesos,
+                                 amortecimento, p, self._vetor_inicial(csr, inicial),
+                                 tolerancia, max_iteracoes)
+        return dict(zip(csr.nomes, pontuacao.tolist()))
+    
+    def hits(self, inicial: Optional[Dict[str, float]] = None, tolerancia: float = 1e-10,
+             max_iteracoes: int = 100) -> Tuple[Dict[str, float], Dict[str, float]]:
+        """
+        Calcula as pontuações de hub e autoridade (HITS) ponderadas pelas interações
+        
+        Args:
+            inicial: Pontuações de hub anteriores usadas como ponto de partida (warm start)
+            tolerancia: Variação total (L1) abaixo da qual a iteração para
+            max_iteracoes: Máximo de iterações
+            
+        Returns:
+            Tupla (hubs, autoridades), dicionários usuário -> pontuação (soma 1)
+        """
+        if self.grafo is None:
+            raise Exception("Grafo não construído")
+        
+        csr = self.grafo.snapshot_csr()
+        hubs, autoridades, _ = _hits(csr.quantidade_vertices(), csr.origens(), csr.destinos, csr.pesos,
+                                     self._vetor_inicial(csr, inicial), tolerancia, max_iteracoes)
+        return dict(zip(csr.nomes, hubs.tolist())), dict(zip(csr.nomes, autoridades.tolist()))
 
-    def remover_maior_fragmentador(self):
+    def remover_maior_fragmentador(self, processos: Optional[int] = None, modo: str = 'exato',
+                                   amostras: Optional[int] = None, epsilon: Optional[float] = None,
+                                   semente: Optional[int] = None):
         """
         Identifica e remove o vértice que causa maior fragmentação no grafo
+        
+        Args:
+            processos: Processos usados no cálculo de betweenness (padrão: todos os núcleos)
+            modo: 'exato' (betweenness completo), 'aproximado' (amostragem de pivôs) ou
+                'articulacao' (ponto de articulação que desconecta mais pares de vértices,
+                em tempo linear; sem pontos de articulação, recai no modo aproximado)
+            amostras: No modo aproximado, quantidade fixa de pivôs sorteados
+            epsilon: No modo aproximado, erro máximo desejado (padrão: EPSILON_FRAGMENTACAO)
+            semente: Semente do sorteio de pivôs
         """
         if self.grafo is None:
             raise Exception("Grafo não construído")
         
+        if modo == 'articulacao':
+            pontuacao = self.grafo.pontuar_pontos_articulacao()
+            if pontuacao:
+                vertice_remover = max(pontuacao, key=lambda v: (pontuacao[v]['pares_desconectados'],
+                                                                pontuacao[v]['componentes']))
+                print(f"Removendo vértice que causa maior fragmentação: {vertice_remover} "
+                      f"(componentes resultantes: {pontuacao[vertice_remover]['tamanhos']})")
+                self.grafo.remover_vertice(vertice_remover)
+                return vertice_remover
+            modo = 'aproximado'
+        
         # Implementação alternativa de betweenness centrality
-        betweenness = self._calcular_betweenness()
+        if modo == 'exato':
+            betweenness = self._calcular_betweenness(processos=processos)
+        elif modo == 'aproximado':
+            if amostras is None and epsilon is None:
+                epsilon = self.EPSILON_FRAGMENTACAO
+            betweenness, erro = self._calcular_betweenness_aproximado(
+                amostras=amostras, epsilon=epsilon, semente=semente, processos=processos)
+            print(f"Betweenness estimado com erro máximo de {erro:.4f}")
+        else:
+            raise ValueError(f"Modo de fragmentação inválido: {modo}")
         vertice_remover = max(betweenness, key=betweenness.get)
         
         print(f"Removendo vértice que causa maior fragmentação: {vertice_remover}")
         self.grafo.remover_vertice(vertice_remover)
         return vertice_remover
     
-    def _calcular_betweenness(self) -> Dict[str, float]:
-        """Calcula betweenness centrality sem NetworkX"""
-        betweenness = {v: 0.0 for v in self.grafo.vertices}
-        
-        for s in self.grafo.vertices:
-            # Estruturas para o algoritmo
-            S = []
-            P = {v: [] for v in self.grafo.vertices}
-            sigma = {v: 0 for v in self.grafo.vertices}
-            sigma[s] = 1
-            d = {v: -1 for v in self.grafo.vertices}
-            d[s] = 0
-            Q = deque()
-            Q.append(s)
-            
-            while Q:
-                v = Q.popleft()
-                S.append(v)
-                for w in self._obter_vizinhos_direcionados(v):
-                    if d[w] < 0:
-                        Q.append(w)
-                        d[w] = d[v] + 1
-                    if d[w] == d[v] + 1:
-                        sigma[w] += sigma[v]
-                        P[w].append(v)
-            
-            delta = {v: 0 for v in self.grafo.vertices}
-            while S:
-                w = S.pop()
-                for v in P[w]:
-                    delta[v] += (sigma[v] / sigma[w]) * (1 + delta[w])
-                if w != s:
-                    betweenness[w] += delta[w]
+    def campanha_fragmentacao(self, k: int, processos: Optional[int] = None) -> List[Dict]:
+        """
+        Remove, um após o outro, os k vértices de maior betweenness e registra a curva
+        de fragmentação (componentes fracamente conexas após cada remoção)
+        
+        Betweenness é calculado por completo apenas uma vez. A cada remoção, só as fontes
+        que alcançavam o vértice removido (as únicas cujo DAG de caminhos mínimos muda)
+        são refeitas: a contribuição delas é subtraída no grafo anterior e somada de novo
+        no grafo atual. Isso custa duas passadas por fonte afetada, então, quando elas
+        são metade dos vértices ou mais (interações nos dois sentidos fazem toda a
+        componente alcançar o vértice), o betweenness é recalculado por completo. Só a
+        componente que continha o vértice é percorrida novamente.
+        
+        Args:
+            k: Quantidade de vértices a remover
+            processos: Processos usados no cálculo de betweenness (padrão: todos os núcleos)
+            
+        Returns:
+            Lista com um dicionário por remoção: vértice removido, seu betweenness
+            normalizado, número de componentes e tamanhos das componentes (decrescente)
+        """
+        if self.grafo is None:
+            raise Exception("Grafo não construído")
+        
+        # Os ids do snapshot inicial identificam os vértices durante toda a campanha
+        csr = self.grafo.snapshot_csr()
+        n = csr.quantidade_vertices()
+        nomes = csr.nomes
+        indice_inicial = csr.indice
+        offsets = csr.offsets.tolist()
+        destinos = csr.destinos.tolist()
+        removidos = [False] * n
+        processos = self._processos_betweenness(processos, n)
+        
+        # Predecessores e vizinhança não direcionada (para componentes fracas)
+        predecessores = [[] for _ in range(n)]
+        for v in range(n):
+            for w in destinos[offsets[v]:offsets[v + 1]]:
+                predecessores[w].append(v)
+        vizinhos = [set(destinos[offsets[v]:offsets[v + 1]]).union(predecessores[v]) for v in range(n)]
+        
+        # Betweenness (não normalizado) indexado pelos ids iniciais
+        with _AcumuladorBrandes(csr, processos) as acumulador:
+            betweenness, _ = acumulador.acumular(range(n))
+        
+        # Componentes fracamente conexas iniciais
+        componente = [-1] * n
+        membros = {}
+        
+        def rotular(inicio, rotulo):
+            fila = [inicio]
+            componente[inicio] = rotulo
+            encontrados = []
+            while fila:
+                v = fila.pop()
+                encontrados.append(v)
+                for w in vizinhos[v]:
+                    if not removidos[w] and componente[w] != rotulo:
+                        componente[w] = rotulo
+                        fila.append(w)
+            membros[rotulo] = encontrados
+        
+        proximo_rotulo = 0
+        for v in range(n):
+            if componente[v] < 0:
+                rotular(v, proximo_rotulo)
+                proximo_rotulo += 1
+        
+        curva = []
+        restantes = n
+        passos = min(k, n)
+        for passo in range(passos):
+            candidatos = np.where(removidos, -np.inf, betweenness)
+            x = int(np.argmax(candidatos))
+            normalizacao = (restantes - 1) * (restantes - 2) if restantes > 2 else 1
+            valor_x = float(betweenness[x]) / normalizacao
+            
+            # Fontes que alcançam x: busca reversa a partir de x no grafo atual
+            afetadas = [x]
+            visitados = {x}
+            fila = deque([x])
+            while fila:
+                v = fila.popleft()
+                for u in predecessores[v]:
+                    if not removidos[u] and u not in visitados:
+                        visitados.add(u)
+                        afetadas.append(u)
+                        fila.append(u)
+            
+            incremental = 2 * len(afetadas) < restantes
+            if incremental and passo < passos - 1:
+                anterior = csr
+                with _AcumuladorBrandes(anterior, processos) as acumulador:
+                    contribuicao, _ = acumulador.acumular([anterior.indice[nomes[s]] for s in afetadas])
+                betweenness[self._ids_iniciais(anterior, indice_inicial)] -= contribuicao
+            
+            removidos[x] = True
+            restantes -= 1
+            nome_x = nomes[x]
+            self.grafo.remover_vertice(nome_x)
+            
+            # Só a componente que continha x pode se dividir
+            rotulo_x = componente[x]
+            for v in membros.pop(rotulo_x):
+                if v != x:
+                    componente[v] = -1
+            # Todo vértice da componente antiga alcança algum vizinho de x sem passar por x
+            for v in vizinhos[x]:
+                if not removidos[v] and componente[v] < 0:
+                    rotular(v, proximo_rotulo)
+                    proximo_rotulo += 1
+            
+            tamanhos = sorted((len(m) for m in membros.values()), reverse=True)
+            curva.append({
+                'vertice': nome_x,
+                'betweenness': valor_x,
+                'componentes': len(tamanhos),
+                'tamanhos': tamanhos,
+            })
+            if passo == passos - 1:
+                break
+            
+            # Atualiza o betweenness no grafo sem x
+            csr = self.grafo.snapshot_csr()
+            ids = self._ids_iniciais(csr, indice_inicial)
+            with _AcumuladorBrandes(csr, processos) as acumulador:
+                if incremental:
+                    contribuicao, _ = acumulador.acumular([csr.indice[nomes[s]] for s in afetadas[1:]])
+                    betweenness[ids] += contribuicao
+                else:
+                    total, _ = acumulador.acumular(range(restantes))
+                    betweenness[:] = 0.0
+                    betweenness[ids] = total
+            betweenness[x] = 0.0
+        
+        return curva
+    
+    @staticmethod
+    def _ids_iniciais(csr: GrafoCSR, indice_inicial: Dict[str, int]) -> np.ndarray:
+        """Id, no snapshot inicial de uma campanha, de cada vértice de um snapshot posterior"""
+        return np.fromiter((indice_inicial[v] for v in csr.nomes), dtype=np.int64,
+                           count=csr.quantidade_vertices())
+    
+    def _processos_betweenness(self, processos: Optional[int], n: int) -> int:
+        """Quantidade efetiva de processos para calcular betweenness em um grafo com n vértices"""
+        if processos is None:
+            processos = os.cpu_count() or 1
+        if n < self.MIN_VERTICES_PARALELO:
+            return 1
+        return processos
+    
+    def _calcular_betweenness(self, processos: Optional[int] = 1,
+                              tamanho_lote: Optional[int] = None) -> Dict[str, float]:
+        """
+        Calcula betweenness centrality sem NetworkX
+        
+        Com mais de um processo, as fontes do algoritmo de Brandes são divididas em lotes
+        entre um pool de processos que compartilham um snapshot CSR somente leitura,
+        e os vetores parciais de centralidade são somados ao final.
+        
+        Args:
+            processos: Número de processos (None = todos os núcleos, 1 = serial)
+            tamanho_lote: Fontes por tarefa enviada ao pool (padrão: ~4 tarefas por processo)
+        """
+        csr = self.grafo.snapshot_csr()
+        n = csr.quantidade_vertices()
+        
+        with _AcumuladorBrandes(csr, self._processos_betweenness(processos, n), tamanho_lote) as acumulador:
+            betweenness, _ = acumulador.acumular(range(n))
         
         # Normalização para grafos direcionados
-        n = len(self.grafo.vertices)
         if n > 2:
-            for v in betweenness:
-                betweenness[v] /= (n - 1) * (n - 2)
+            betweenness /= (n - 1) * (n - 2)
         
-        return betweenness
+        return dict(zip(csr.nomes, betweenness.tolist()))
     
-    def _obter_vizinhos_direcionados(self, v: str) -> List[str]:
-        """Obtém vizinhos direcionados (apenas arestas de saída)"""
-        if self.grafo.representacao == 'lista':
-            return [vizinho for vizinho, _ in self.grafo.estrutura.get(v, [])]
-        else:
-            if not self.grafo._matriz_atualizada:
-                self.grafo._atualizar_matriz()
-            idx = self.grafo._vertex_index[v]
-            return [vertice for vertice, i in self.grafo._vertex_index.items() 
-                   if self.grafo.estrutura[idx][i] > 0]
-
-    def grupos_naturais(self, n_grupos: int = 3) -> List[set[str]]:
+    def _calcular_betweenness_aproximado(self, amostras: Optional[int] = None,
+                                         epsilon: Optional[float] = None,
+                                         confianca: float = 0.95, semente: Optional[int] = None,
+                                         processos: Optional[int] = 1,
+                                         tamanho_lote: Optional[int] = None) -> Tuple[Dict[str, float], float]:
         """
-        Identifica grupos naturais no grafo usando detecção de comunidades (Louvain alternativo)
+        Estima betweenness centrality executando Brandes apenas a partir de pivôs sorteados
+        
+        Com amostras, sorteia essa quantidade de pivôs uniformemente e o erro é dado pelo
+        limite de Hoeffding. Com epsilon, a amostra é dobrada progressivamente até que o
+        limite empírico de Bernstein (que usa a variância observada) ou o de Hoeffding
+        fique abaixo de epsilon. Em ambos os casos, com probabilidade de pelo menos
+        confianca, todas as estimativas ficam a no máximo erro do valor exato normalizado.
+        
+        Args:
+            amostras: Quantidade fixa de pivôs (modo uniforme)
+            epsilon: Erro máximo desejado (modo adaptativo)
+            confianca: Probabilidade de o limite de erro valer para todos os vértices
+            semente: Semente do sorteio de pivôs
+            processos: Número de processos (None = todos os núcleos, 1 = serial)
+            tamanho_lote: Fontes por tarefa enviada ao pool
+            
+        Returns:
+            Tupla (betweenness estimado por vértice, erro máximo alcançado)
         """
-        if self.grafo is None:
-            raise Exception("Grafo não construído")
+        if (amostras is None) == (epsilon is None):
+            raise ValueError("Informe apenas amostras ou apenas epsilon")
+        if not 0 < confianca < 1:
+            raise ValueError("A confiança deve estar entre 0 e 1")
         
-        # Implementação simplificada de detecção de comunidades
-        # Esta é uma versão simplificada - algoritmos reais são mais complexos
+        csr = self.grafo.snapshot_csr()
+        n = csr.quantidade_vertices()
+        if n <= 2:
+            return self._calcular_betweenness(), 0.0
         
-        # Converte para grafo não direcionado (soma pesos em ambas direções)
-        grafo_nao_dir = defaultdict(dict)
-        for (u, v), peso in self.grafo.pesos_arestas.items():
-            grafo_nao_dir[u][v] = grafo_nao_dir[u].get(v, 0) + peso
-            grafo_nao_dir[v][u] = grafo_nao_dir[v].get(u, 0) + peso
+        pivos = list(range(n))
+        random.Random(semente).shuffle(pivos)
         
-        # Algoritmo simplificado de detecção de comunidades
-        comunidades = {v: i for i, v in enumerate(self.grafo.vertices)}
-        mudou = True
+        # Cada pivô contribui com escala * dependência, um valor em [0, alcance]
+        escala = n / ((n - 1) * (n - 2))
+        alcance = n / (n - 1)
+        falha = 1 - confianca
         
-        while mudou:
-            mudou = False
-            for v in self.grafo.vertices:
-                melhor_comunidade = self._encontrar_melhor_comunidade(v, grafo_nao_dir, comunidades)
-                if melhor_comunidade != comunidades[v]:
-                    comunidades[v] = melhor_comunidade
-                    mudou = True
+        def hoeffding(k, falha_rodada):
+            return alcance * math.sqrt(math.log(2 * n / falha_rodada) / (2 * k))
         
-        # Agrupa por comunidade
-        grupos = defaultdict(set)
-        for v, com in comunidades.items():
-            grupos[com].add(v)
+        with _AcumuladorBrandes(csr, self._processos_betweenness(processos, n), tamanho_lote) as acumulador:
+            if amostras is not None:
+                k = min(max(amostras, 1), n)
+                soma, _ = acumulador.acumular(pivos[:k])
+                erro = 0.0 if k == n else hoeffding(k, falha)
+            else:
+                # A probabilidade de falha é dividida entre as rodadas de verificação
+                rodadas = max(1, math.ceil(math.log2(n / self.AMOSTRAS_INICIAIS_BETWEENNESS)) + 1)
+                falha_rodada = falha / rodadas
+                soma = np.zeros(n)
+                quadrados = np.zeros(n)
+                k = 0
+                alvo = min(n, self.AMOSTRAS_INICIAIS_BETWEENNESS)
+                while True:
+                    parcial, parcial_quadrados = acumulador.acumular(pivos[k:alvo])
+                    soma += parcial
+                    quadrados += parcial_quadrados
+                    k = alvo
+                    if k >= n:
+                        erro = 0.0
+                        break
+                    
+                    # Limite empírico de Bernstein (Maurer & Pontil) com união sobre os vértices;
+                    # os dois limites dividem a falha da rodada para que o mínimo valha junto
+                    falha_limite = falha_rodada / 2
+                    media = escala * soma / k
+                    variancia = np.maximum(escala * escala * quadrados - k * media * media, 0) / (k - 1)
+                    log_termo = math.log(4 * n / falha_limite)
+                    bernstein = float(np.max(np.sqrt(2 * variancia * log_termo / k))) + \
+                        7 * alcance * log_termo / (3 * (k - 1))
+                    erro = min(bernstein, hoeffding(k, falha_limite))
+                    if erro <= epsilon:
+                        break
+                    alvo = min(n, 2 * k)
         
-        # Retorna os maiores grupos
-        return sorted(grupos.values(), key=len, reverse=True)[:n_grupos]
+        estimativa = escala * soma / k if k < n else soma / ((n - 1) * (n - 2))
+        return dict(zip(csr.nomes, estimativa.tolist())), erro
     
-    def _encontrar_melhor_comunidade(self, v, grafo, comunidades):
-        """Auxiliar para encontrar a melhor comunidade para um vértice"""
-        vizinhos = grafo.get(v, {})
-        comunidades_vizinhos = defaultdict(int)
+    def detectar_comunidades(self, resolucao: float = 1.0, semente: Optional[int] = 0,
+                             max_iteracoes: int = 100) -> Tuple[Dict[str, int], float]:
+        """
+        Detecta comunidades com o método de Louvain multinível
+        
+        O grafo é tratado como não direcionado, somando os pesos das interações nos
+        dois sentidos.
         
-        for vizinho, peso in vizinhos.items():
-            com = comunidades[vizinho]
-            comunidades_vizinhos[com] += peso
+        Args:
+            resolucao: Resolução da modularidade (maior gera comunidades menores)
+            semente: Semente da ordem de visita dos vértices (mesma semente, mesma partição)
+            max_iteracoes: Máximo de passadas da fase local em cada nível
+            
+        Returns:
+            Tupla (comunidade de cada vértice, modularidade da partição)
+        """
+        if self.grafo is None:
+            raise Exception("Grafo não construído")
         
-        if not comunidades_vizinhos:
-            return comunidades[v]
+        if semente is None:  # Partição sorteada: não há o que reaproveitar
+            return self._detectar_comunidades(resolucao, semente, max_iteracoes)
+        chave = ('comunidades', resolucao, semente, max_iteracoes)
+        particao, modularidade = self._memorizado(chave, self._detectar_comunidades,
+                                                  resolucao, semente, max_iteracoes)
+        return dict(particao), modularidade
+    
+    def _detectar_comunidades(self, resolucao: float, semente: Optional[int],
+                              max_iteracoes: int) -> Tuple[Dict[str, int], float]:
+        """Executa o Louvain no snapshot atual do grafo (ver detectar_comunidades)"""
+        csr = self.grafo.snapshot_csr()
+        origens = csr.origens()
+        membro, modularidade = _louvain(
+            csr.quantidade_vertices(),
+            np.concatenate((origens, csr.destinos)),
+            np.concatenate((csr.destinos, origens)),
+            np.concatenate((csr.pesos, csr.pesos)),
+            resolucao=resolucao, semente=semente, max_iteracoes=max_iteracoes)
         
-        return max(comunidades_vizinhos.items(), key=lambda x: x[1])[0]
+        particao = dict(zip(csr.nomes, membro.tolist()))
+        return particao, modularidade
+    
+    @staticmethod
+    def _maiores_grupos(particao: Dict[str, int], n_grupos: int) -> List[set[str]]:
+        """Agrupa os vértices por comunidade e retorna os n maiores grupos"""
+        grupos = defaultdict(set)
+        for v, com in particao.items():
+            grupos[com].add(v)
+        return sorted(grupos.values(), key=len, reverse=True)[:n_grupos]
+    
+    def grupos_naturais(self, n_grupos: int = 3, semente: Optional[int] = 0) -> List[set[str]]:
+        """
+        Identifica grupos naturais no grafo usando detecção de comunidades (Louvain)
+        """
+        particao, _ = self.detectar_comunidades(semente=semente)
+        return self._maiores_grupos(particao, n_grupos)
 
     def nivel_conexao(self) -> float:
         """
@@ -536,61 +2142,116 @@ class SocialGraph:
         actual_edges = self.grafo.quantidade_arestas()
         return (actual_edges / max_edges) * 100
 
-    def usuarios_proximos(self, usuario: str, n: int = 5) -> List[tuple[str, float]]:
+    def usuarios_proximos(self, usuario: str, n: int = 5,
+                          distancia_maxima: Optional[float] = None) -> List[tuple[str, float]]:
         """
         Retorna os usuários mais próximos a um determinado usuário usando Dijkstra
+        
+        A busca usa um heap binário com remoção preguiçosa e para assim que os n
+        usuários mais próximos são definitivos (ou a distância máxima é ultrapassada).
+        O resultado é guardado até a próxima alteração do grafo.
         """
         if self.grafo is None:
             raise Exception("Grafo não construído")
         if usuario not in self.grafo.vertices:
             raise ValueError(f"Usuário {usuario} não encontrado no grafo")
         
-        distancias = {v: float('inf') for v in self.grafo.vertices}
-        distancias[usuario] = 0
+        chave = ('proximos', usuario, n, distancia_maxima)
+        return list(self._memorizado(chave, self._usuarios_proximos, usuario, n, distancia_maxima))
+    
+    def _usuarios_proximos(self, usuario: str, n: int,
+                           distancia_maxima: Optional[float]) -> List[tuple[str, float]]:
+        """Executa o Dijkstra a partir do usuário (ver usuarios_proximos)"""
+        distancias = {usuario: 0.0}
         visitados = set()
+        heap = [(0.0, usuario)]
+        resultado = []
         
-        while len(visitados) < len(self.grafo.vertices):
-            # Encontra o vértice não visitado com menor distância
-            corrente = None
-            menor_dist = float('inf')
-            for v in self.grafo.vertices:
-                if v not in visitados and distancias[v] < menor_dist:
-                    menor_dist = distancias[v]
-                    corrente = v
-            
-            if corrente is None:
-                break
+        while heap and len(resultado) < n:
+            dist, corrente = heapq.heappop(heap)
+            if corrente in visitados:
+                continue  # Entrada obsoleta do heap
             
             visitados.add(corrente)
+            if corrente != usuario:
+                resultado.append((corrente, dist))
+                if len(resultado) >= n:
+                    break
             
             # Atualiza distâncias dos vizinhos
-            for vizinho, peso in self._obter_vizinhos_pesos(corrente):
-                if distancias[vizinho] > distancias[corrente] + (1 / peso if peso > 0 else float('inf')):
-                    distancias[vizinho] = distancias[corrente] + (1 / peso if peso > 0 else float('inf'))
+            for vizinho, peso in self.grafo.obter_vizinhos_pesos(corrente):
+                if peso <= 0 or vizinho in visitados:
+                    continue
+                nova_dist = dist + 1 / peso
+                if distancia_maxima is not None and nova_dist > distancia_maxima:
+                    continue
+                if nova_dist < distancias.get(vizinho, float('inf')):
+                    distancias[vizinho] = nova_dist
+                    heapq.heappush(heap, (nova_dist, vizinho))
         
-        # Remove o próprio usuário e infinitos
-        distancias.pop(usuario)
-        distancias = {k: v for k, v in distancias.items() if v != float('inf')}
+        return resultado
+
+    def caminho_entre(self, origem: str, destino: str) -> Tuple[List[str], float]:
+        """
+        Retorna o caminho mais curto (custo 1/peso por interação) entre dois usuários,
+        usando Dijkstra bidirecional
         
-        return sorted(distancias.items(), key=lambda x: x[1])[:n]
+        Returns:
+            Tupla (caminho da origem ao destino, custo total); caminho vazio e custo
+            infinito se o destino não é alcançável
+        """
+        return self.caminhos_entre([(origem, destino)])[0]
+    
+    def caminhos_entre(self, pares: Iterable[Tuple[str, str]]) -> List[Tuple[List[str], float]]:
+        """
+        Calcula o caminho mais curto de vários pares de usuários (Dijkstra bidirecional)
+        
+        As listas de vizinhos de saída e de entrada consultadas são guardadas e
+        reaproveitadas entre os pares do lote.
+        
+        Args:
+            pares: Pares (origem, destino)
+            
+        Returns:
+            Lista de (caminho, custo), na ordem dos pares
+        """
+        if self.grafo is None:
+            raise Exception("Grafo não construído")
+        
+        sucessores = {}
+        predecessores = {}
+        
+        def vizinhos_saida(v):
+            if v not in sucessores:
+                sucessores[v] = self.grafo.obter_vizinhos_pesos(v)
+            return sucessores[v]
+        
+        def vizinhos_entrada(v):
+            if v not in predecessores:
+                predecessores[v] = self.grafo.obter_predecessores_pesos(v)
+            return predecessores[v]
+        
+        resultado = []
+        for origem, destino in pares:
+            for usuario in (origem, destino):
+                if usuario not in self.grafo.vertices:
+                    raise ValueError(f"Usuário {usuario} não encontrado no grafo")
+            caminho, custo, _ = _dijkstra_bidirecional(origem, destino, vizinhos_saida, vizinhos_entrada)
+            resultado.append((caminho, custo))
+        return resultado
     
-    def _obter_vizinhos_pesos(self, v: str) -> List[tuple[str, float]]:
-        """Obtém vizinhos e pesos das arestas de saída"""
-        if self.grafo.representacao == 'lista':
-            return self.grafo.estrutura.get(v, [])
-        else:
-            if not self.grafo._matriz_atualizada:
-                self.grafo._atualizar_matriz()
-            idx = self.grafo._vertex_index[v]
-            return [(vertice, self.grafo.estrutura[idx][i]) 
-                   for vertice, i in self.grafo._vertex_index.items() 
-                   if self.grafo.estrutura[idx][i] > 0]
-
     def usuarios_proximos_nao_interagem(self, usuario: str, n: int = 5) -> List[tuple[str, float]]:
         """
         Retorna usuários próximos que não têm interação direta
         """
-        proximos = self.usuarios_proximos(usuario, n*2)  # Pegamos mais para filtrar
+        if self.grafo is None:
+            raise Exception("Grafo não construído")
+        if usuario not in self.grafo.vertices:
+            raise ValueError(f"Usuário {usuario} não encontrado no grafo")
+        
+        # Só os vizinhos diretos podem ser descartados: buscá-los a mais garante n resultados
+        # sempre que houver n usuários alcançáveis sem interação direta
+        proximos = self.usuarios_proximos(usuario, n + self.grafo.grau_saida(usuario))
         
         # Filtra os que não têm aresta direta
         resultado = []
@@ -601,6 +2262,59 @@ class SocialGraph:
                     break
                     
         return resultado
+    
+    def recomendar_conexoes(self, k: int = 5, metrica: str = 'adamic_adar',
+                            usuarios: Optional[Iterable[str]] = None) -> Dict[str, List[tuple[str, float]]]:
+        """
+        Recomenda, para cada usuário, quem ainda não interage com ele mas tem mais
+        vizinhos em comum (predição de ligações, ignorando a direção das interações)
+        
+        Args:
+            k: Recomendações por usuário
+            metrica: 'vizinhos_comuns', 'jaccard' ou 'adamic_adar'
+            usuarios: Usuários para os quais recomendar (padrão: todos)
+            
+        Returns:
+            Dicionário usuário -> lista de (usuário recomendado, pontuação), decrescente
+        """
+        if self.grafo is None:
+            raise Exception("Grafo não construído")
+        if metrica not in self.METRICAS_LIGACAO:
+            raise ValueError(f"Métrica de predição inválida: {metrica}")
+        
+        if usuarios is not None:
+            usuarios = tuple(usuarios)
+        recomendacoes = self._memorizado(('recomendacoes', k, metrica, usuarios),
+                                         self._recomendar_conexoes, k, metrica, usuarios)
+        return {u: list(r) for u, r in recomendacoes.items()}
+    
+    def _recomendar_conexoes(self, k: int, metrica: str,
+                             usuarios: Optional[Tuple[str, ...]]) -> Dict[str, List[tuple[str, float]]]:
+        """Calcula as recomendações no snapshot atual do grafo (ver recomendar_conexoes)"""
+        csr = self.grafo.snapshot_csr()
+        n = csr.quantidade_vertices()
+        origens = csr.origens()
+        laco = origens == csr.destinos
+        origens, destinos, _ = _agregar_arestas(
+            n, np.concatenate((origens[~laco], csr.destinos[~laco])),
+            np.concatenate((csr.destinos[~laco], origens[~laco])), np.ones(2 * int((~laco).sum())))
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(origens, minlength=n), out=offsets[1:])
+        
+        if usuarios is None:
+            fontes = range(n)
+        else:
+            fontes = []
+            for usuario in usuarios:
+                if usuario not in csr.indice:
+                    raise ValueError("Usuário não encontrado no grafo")
+                fontes.append(csr.indice[usuario])
+        
+        nomes = csr.nomes
+        return {
+            nomes[u]: [(nomes[v], p) for v, p in zip(candidatos.tolist(), pontuacao.tolist())]
+            for u, candidatos, pontuacao in _prever_ligacoes(offsets, destinos, fontes, k, metrica)
+        }
 
 if __name__ == "__main__":
     try:
@@ -1,30 +1,126 @@
+from array import array
+from collections.abc import Mapping, Set
 import csv
+import gzip
+import json
+import struct
 import matplotlib.pyplot as plt
-from typing import Dict, List, Optional, Tuple, Union
+import numpy as np
+from itertools import islice
+from types import MappingProxyType
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
 import math
 
 class Grafo:
+    __slots__ = ('representacao', '_ids', '_nomes', '_pesos_vertices', '_rotulos_vertices',
+                 '_saida', '_entrada', '_forca_saida', '_forca_entrada',
+                 '_origem', '_destino', '_peso', '_rotulo', '_arestas_removidas', '_matriz',
+                 '_versao')
+    
+    CAPACIDADE_INICIAL = 16  # Capacidade inicial do buffer da matriz de adjacência
+    POLITICAS_MESCLAGEM = ('substituir', 'soma', 'max')  # Combinação de pesos em lote
+    TAMANHO_BUFFER_CSV = 1 << 20  # Buffer de leitura/escrita dos arquivos CSV (1 MiB)
+    MIN_COMPACTACAO = 1024  # Arestas removidas antes de considerar compactar os arrays
+
     def __init__(self, representacao: str = 'lista'):
         """
         Inicializa um grafo vazio com a representação escolhida
         
+        Os vértices são internados em ids inteiros densos (0..V-1) e os atributos de
+        vértices e arestas ficam em arrays tipados indexados por esses ids.
+        
         Args:
             representacao: 'matriz' para matriz de adjacência ou 'lista' para lista de adjacência
         """
         self.representacao = representacao
-        self.vertices = set()
-        self.arestas = []
-        self.pesos_vertices = {}
-        self.rotulos_vertices = {}
-        self.pesos_arestas = {}
-        self.rotulos_arestas = {}
+        
+        # Vértices: nome <-> id e atributos por id
+        self._ids = {}  # Nome do vértice -> id
+        self._nomes = []  # Id -> nome do vértice
+        self._pesos_vertices = array('d')  # Peso por id (NaN = não definido)
+        self._rotulos_vertices = []  # Rótulo por id ('' = não definido)
+        self._saida = []  # Id -> {id do destino: id da aresta}
+        self._entrada = []  # Id -> {id da origem: id da aresta}
+        self._forca_saida = array('d')  # Id -> soma dos pesos das arestas de saída
+        self._forca_entrada = array('d')  # Id -> soma dos pesos das arestas de entrada
+        
+        # Arestas: colunas paralelas indexadas pelo id da aresta, em ordem de inserção
+        self._origem = array('q')  # Id do vértice de origem (-1 = aresta removida)
+        self._destino = array('q')  # Id do vértice de destino
+        self._peso = array('d')
+        self._rotulo = []
+        self._arestas_removidas = 0
+        self._versao = 0  # Incrementada a cada alteração de vértices ou arestas
         
         if representacao == 'matriz':
-            self.estrutura = []
-            self._matriz_atualizada = False
-            self._vertex_index = {}  # Mapeamento de vértices para índices
+            self._matriz = np.zeros((self.CAPACIDADE_INICIAL, self.CAPACIDADE_INICIAL))
         else:
-            self.estrutura = {}  # Dicionário para lista de adjacência
+            self._matriz = None
+
+    @property
+    def versao(self) -> int:
+        """Contador de alterações do grafo, útil para invalidar resultados em cache"""
+        return self._versao
+
+    @property
+    def vertices(self):
+        """Conjunto (somente leitura) com os nomes dos vértices"""
+        return self._ids.keys()
+
+    @property
+    def arestas(self) -> '_VisaoArestas':
+        """Conjunto (somente leitura) das arestas (u, v), em ordem de inserção"""
+        return _VisaoArestas(self)
+
+    @property
+    def pesos_arestas(self) -> '_VisaoPesosArestas':
+        """Mapeamento (somente leitura) de (u, v) para o peso da aresta"""
+        return _VisaoPesosArestas(self)
+
+    @property
+    def rotulos_arestas(self) -> '_VisaoRotulosArestas':
+        """Mapeamento (somente leitura) de (u, v) para o rótulo das arestas rotuladas"""
+        return _VisaoRotulosArestas(self)
+
+    @property
+    def pesos_vertices(self) -> '_VisaoAtributoVertices':
+        """Mapeamento (somente leitura) dos pesos definidos para os vértices"""
+        return _VisaoAtributoVertices(self, '_pesos_vertices', lambda peso: peso == peso)
+
+    @property
+    def rotulos_vertices(self) -> '_VisaoAtributoVertices':
+        """Mapeamento (somente leitura) dos rótulos definidos para os vértices"""
+        return _VisaoAtributoVertices(self, '_rotulos_vertices', bool)
+
+    @property
+    def estrutura(self):
+        """
+        Matriz de adjacência V×V com linhas e colunas em ordem alfabética dos vértices
+        (cópia do buffer NumPy) ou lista de adjacência (mapeamento vértice -> lista de
+        (vizinho, peso)), no mesmo formato de antes dos ids internos
+        """
+        if self.representacao == 'matriz':
+            ordem = sorted(range(len(self._nomes)), key=self._nomes.__getitem__)
+            return self._matriz[np.ix_(ordem, ordem)]
+        return _VisaoAdjacencia(self)
+    
+    def _id_vertice(self, v: str) -> int:
+        """Retorna o id do vértice, criando-o se necessário"""
+        i = self._ids.get(v)
+        if i is None:
+            i = len(self._nomes)
+            if self.representacao == 'matriz':
+                self._reservar_matriz(i + 1)
+            self._ids[v] = i
+            self._nomes.append(v)
+            self._pesos_vertices.append(NAO_DEFINIDO)
+            self._rotulos_vertices.append('')
+            self._saida.append({})
+            self._entrada.append({})
+            self._forca_saida.append(0.0)
+            self._forca_entrada.append(0.0)
+            self._versao += 1
+        return i
     
     def adicionar_vertice(self, v: str, peso: float = 1, rotulo: str = ''):
         """
@@ -35,18 +131,35 @@ class Grafo:
             peso: Peso do vértice (opcional)
             rotulo: Rótulo do vértice (opcional)
         """
-        if v not in self.vertices:
-            self.vertices.add(v)
-            
-            if self.representacao == 'lista':
-                self.estrutura[v] = []
-            else:
-                self._matriz_atualizada = False
-            
+        i = self._id_vertice(v)
         if peso != 1:
-            self.pesos_vertices[v] = peso
+            self._pesos_vertices[i] = peso
+            self._versao += 1
         if rotulo:
-            self.rotulos_vertices[v] = rotulo
+            self._rotulos_vertices[i] = rotulo
+            self._versao += 1
+    
+    def _criar_aresta(self, i: int, j: int, peso: float, rotulo: str = '') -> int:
+        """Cria a aresta i -> j (que ainda não existe) e retorna o seu id"""
+        e = len(self._origem)
+        self._origem.append(i)
+        self._destino.append(j)
+        self._peso.append(peso)
+        self._rotulo.append(rotulo)
+        self._saida[i][j] = e
+        self._entrada[j][i] = e
+        self._forca_saida[i] += peso
+        self._forca_entrada[j] += peso
+        self._versao += 1
+        return e
+    
+    def _atualizar_peso_aresta(self, e: int, peso: float):
+        """Troca o peso da aresta e mantendo as forças dos vértices atualizadas"""
+        diferenca = peso - self._peso[e]
+        self._forca_saida[self._origem[e]] += diferenca
+        self._forca_entrada[self._destino[e]] += diferenca
+        self._peso[e] = peso
+        self._versao += 1
     
     def adicionar_aresta(self, u: str, v: str, peso: float = 1, rotulo: str = ''):
         """
@@ -59,41 +172,219 @@ class Grafo:
             rotulo: Rótulo da aresta (opcional, padrão='')
         """
         # Adiciona os vértices se não existirem
-        self.adicionar_vertice(u)
-        self.adicionar_vertice(v)
-            
-        if (u, v) not in self.arestas:
-            self.arestas.append((u, v))
+        i = self._id_vertice(u)
+        j = self._id_vertice(v)
         
-        self.pesos_arestas[(u, v)] = peso
-        if rotulo:
-            self.rotulos_arestas[(u, v)] = rotulo
+        e = self._saida[i].get(j)
+        if e is None:
+            self._criar_aresta(i, j, peso, rotulo)
+        else:
+            self._atualizar_peso_aresta(e, peso)
+            if rotulo:
+                self._rotulo[e] = rotulo
+                self._versao += 1
+        
+        if self.representacao == 'matriz':
+            self._matriz[i, j] = peso
+    
+    def adicionar_arestas(self, arestas: Optional[Iterable[tuple]] = None,
+                          origens: Optional[Sequence[str]] = None,
+                          destinos: Optional[Sequence[str]] = None,
+                          pesos: Optional[Sequence[float]] = None,
+                          rotulos: Optional[Sequence[str]] = None,
+                          mesclar: str = 'substituir'):
+        """
+        Adiciona um lote de arestas de uma só vez
+        
+        As arestas podem ser informadas como um iterável de tuplas ou em colunas.
+        Arestas repetidas (no lote ou já existentes no grafo) têm os pesos combinados
+        segundo a política de mesclagem; o lote é deduplicado antes de ser inserido.
+        
+        Args:
+            arestas: Iterável de tuplas (u, v), (u, v, peso) ou (u, v, peso, rotulo)
+            origens: Coluna com os vértices de origem (alternativa a arestas)
+            destinos: Coluna com os vértices de destino
+            pesos: Coluna com os pesos (opcional, padrão=1)
+            rotulos: Coluna com os rótulos (opcional, padrão='')
+            mesclar: 'substituir', 'soma' ou 'max' para combinar pesos repetidos
+        """
+        if mesclar not in self.POLITICAS_MESCLAGEM:
+            raise ValueError(f"Política de mesclagem inválida: {mesclar}")
+        
+        if arestas is None:
+            if origens is None or destinos is None:
+                raise ValueError("Informe as arestas ou as colunas de origens e destinos")
+            colunas = [origens, destinos]
+            if pesos is not None or rotulos is not None:
+                colunas.append(pesos if pesos is not None else [1] * len(origens))
+            if rotulos is not None:
+                colunas.append(rotulos)
+            arestas = zip(*[c.tolist() if isinstance(c, np.ndarray) else c for c in colunas])
+        
+        # Deduplica o lote combinando os pesos
+        lote = {}
+        rotulos_lote = {}
+        for aresta in arestas:
+            chave = (aresta[0], aresta[1])
+            peso = aresta[2] if len(aresta) > 2 else 1
+            if chave in lote:
+                lote[chave] = self._mesclar_pesos(lote[chave], peso, mesclar)
+            else:
+                lote[chave] = peso
+            if len(aresta) > 3 and aresta[3]:
+                rotulos_lote[chave] = aresta[3]
+        
+        # Cria os vértices novos de uma vez (a matriz cresce no máximo uma vez)
+        novos = {}
+        for u, v in lote:
+            if u not in self._ids:
+                novos[u] = None
+            if v not in self._ids:
+                novos[v] = None
+        if self.representacao == 'matriz':
+            self._reservar_matriz(len(self._nomes) + len(novos))
+        for v in novos:
+            self._id_vertice(v)
+        
+        ids = self._ids
+        linhas, colunas_matriz, valores = [], [], []
+        for (u, v), peso in lote.items():
+            i, j = ids[u], ids[v]
+            e = self._saida[i].get(j)
+            if e is None:
+                e = self._criar_aresta(i, j, peso)
+            else:
+                peso = self._mesclar_pesos(self._peso[e], peso, mesclar)
+                self._atualizar_peso_aresta(e, peso)
             
+            rotulo = rotulos_lote.get((u, v))
+            if rotulo:
+                self._rotulo[e] = rotulo
+                self._versao += 1
+            if self.representacao == 'matriz':
+                linhas.append(i)
+                colunas_matriz.append(j)
+                valores.append(peso)
+        
+        if linhas:
+            self._matriz[linhas, colunas_matriz] = valores
+    
+    @staticmethod
+    def _mesclar_pesos(atual: float, novo: float, politica: str) -> float:
+        """Combina o peso atual de uma aresta com um novo peso segundo a política"""
+        if politica == 'soma':
+            return atual + novo
+        if politica == 'max':
+            return max(atual, novo)
+        return novo
+    
+    def _reservar_matriz(self, n: int):
+        """Garante capacidade para n vértices no buffer da matriz (crescimento por duplicação)"""
+        capacidade = self._matriz.shape[0]
+        if n > capacidade:
+            while capacidade < n:
+                capacidade *= 2
+            self._redimensionar_matriz(capacidade)
+    
+    def _redimensionar_matriz(self, capacidade: int):
+        """Copia a matriz de adjacência para um novo buffer com a capacidade informada"""
+        n = min(len(self._nomes), capacidade)
+        novo = np.zeros((capacidade, capacidade))
+        novo[:n, :n] = self._matriz[:n, :n]
+        self._matriz = novo
+    
+    def _apagar_aresta(self, e: int):
+        """Remove a aresta e dos índices, deixando uma lacuna nas colunas de arestas"""
+        i, j = self._origem[e], self._destino[e]
+        peso = self._peso[e]
+        del self._saida[i][j]
+        del self._entrada[j][i]
+        self._forca_saida[i] -= peso
+        self._forca_entrada[j] -= peso
         if self.representacao == 'matriz':
-            self._matriz_atualizada = False
-        else:
-            # Verifica se a aresta já existe na lista de adjacência
-            if not any(vertice == v for vertice, _ in self.estrutura[u]):
-                self.estrutura[u].append((v, peso))
+            self._matriz[i, j] = 0
+        
+        self._origem[e] = -1
+        self._destino[e] = -1
+        self._rotulo[e] = ''
+        self._arestas_removidas += 1
+        self._versao += 1
     
-    def _atualizar_matriz(self):
-        """Atualiza a matriz de adjacência baseada nos vértices e arestas atuais"""
-        if not self.representacao == 'matriz':
+    def _compactar_arestas(self):
+        """
+        Elimina as lacunas deixadas por arestas removidas quando elas passam a ser
+        maioria, preservando a ordem de inserção (custo amortizado O(1) por remoção)
+        """
+        total = len(self._origem)
+        if self._arestas_removidas < self.MIN_COMPACTACAO or 2 * self._arestas_removidas < total:
             return
         
-        num_vertices = len(self.vertices)
-        self.estrutura = [[0] * num_vertices for _ in range(num_vertices)]
+        vivas = [e for e in range(total) if self._origem[e] >= 0]
+        self._origem = array('q', (self._origem[e] for e in vivas))
+        self._destino = array('q', (self._destino[e] for e in vivas))
+        self._peso = array('d', (self._peso[e] for e in vivas))
+        self._rotulo = [self._rotulo[e] for e in vivas]
+        self._arestas_removidas = 0
         
-        # Mapeia vértices para índices
-        self._vertex_index = {v: i for i, v in enumerate(sorted(self.vertices))}
+        for e, (i, j) in enumerate(zip(self._origem, self._destino)):
+            self._saida[i][j] = e
+            self._entrada[j][i] = e
+    
+    def _remover_id_vertice(self, i: int):
+        """
+        Libera o id do vértice (sem arestas) movendo o último vértice para o seu lugar,
+        o que mantém os ids densos e a matriz compacta
+        """
+        ultimo = len(self._nomes) - 1
+        del self._ids[self._nomes[i]]
         
-        # Preenche a matriz com os pesos das arestas
-        for u, v in self.arestas:
-            i = self._vertex_index[u]
-            j = self._vertex_index[v]
-            self.estrutura[i][j] = self.pesos_arestas.get((u, v), 1)
+        if i != ultimo:
+            w = self._nomes[ultimo]
+            self._ids[w] = i
+            self._nomes[i] = w
+            self._pesos_vertices[i] = self._pesos_vertices[ultimo]
+            self._rotulos_vertices[i] = self._rotulos_vertices[ultimo]
+            self._forca_saida[i] = self._forca_saida[ultimo]
+            self._forca_entrada[i] = self._forca_entrada[ultimo]
+            
+            # Renumera o vértice movido nas suas arestas e nos índices dos vizinhos
+            saida, entrada = self._saida[ultimo], self._entrada[ultimo]
+            self._saida[i], self._entrada[i] = saida, entrada
+            for j, e in saida.items():
+                self._origem[e] = i
+                if j != ultimo:
+                    self._entrada[j][i] = self._entrada[j].pop(ultimo)
+            for k, e in entrada.items():
+                self._destino[e] = i
+                if k != ultimo:
+                    self._saida[k][i] = self._saida[k].pop(ultimo)
+            if ultimo in saida:  # Laço no próprio vértice
+                saida[i] = saida.pop(ultimo)
+                entrada[i] = entrada.pop(ultimo)
+            
+            if self.representacao == 'matriz':
+                matriz = self._matriz
+                matriz[i, :ultimo + 1] = matriz[ultimo, :ultimo + 1]
+                matriz[:ultimo + 1, i] = matriz[:ultimo + 1, ultimo]
+        
+        self._versao += 1
+        self._nomes.pop()
+        self._pesos_vertices.pop()
+        self._rotulos_vertices.pop()
+        self._saida.pop()
+        self._entrada.pop()
+        self._forca_saida.pop()
+        self._forca_entrada.pop()
         
-        self._matriz_atualizada = True
+        if self.representacao == 'matriz':
+            matriz = self._matriz
+            matriz[ultimo, :ultimo + 1] = 0
+            matriz[:ultimo + 1, ultimo] = 0
+            
+            # Devolve memória quando a matriz fica muito esparsa em relação ao buffer
+            capacidade = matriz.shape[0]
+            if capacidade > self.CAPACIDADE_INICIAL and ultimo <= capacidade // 4:
+                self._redimensionar_matriz(capacidade // 2)
     
     def remover_aresta(self, u: str, v: str):
         """
@@ -103,19 +394,12 @@ class Grafo:
             u: Vértice de origem
             v: Vértice de destino
         """
-        if (u, v) not in self.arestas:
+        i, j = self._ids.get(u), self._ids.get(v)
+        if i is None or j is None or j not in self._saida[i]:
             raise ValueError("Aresta não existe")
-            
-        self.arestas.remove((u, v))
-        if (u, v) in self.pesos_arestas:
-            del self.pesos_arestas[(u, v)]
-        if (u, v) in self.rotulos_arestas:
-            del self.rotulos_arestas[(u, v)]
-            
-        if self.representacao == 'matriz':
-            self._matriz_atualizada = False
-        else:
-            self.estrutura[u] = [(vertice, peso) for vertice, peso in self.estrutura[u] if vertice != v]
+        
+        self._apagar_aresta(self._saida[i][j])
+        self._compactar_arestas()
     
     def remover_vertice(self, v: str):
         """
@@ -124,23 +408,18 @@ class Grafo:
         Args:
             v: Vértice a ser removido
         """
-        if v not in self.vertices:
+        i = self._ids.get(v)
+        if i is None:
             raise ValueError("Vértice não existe")
-            
-        self.vertices.remove(v)
         
-        # Remove arestas associadas
-        arestas_para_remover = [(u, w) for u, w in self.arestas if u == v or w == v]
-        for u, w in arestas_para_remover:
-            self.remover_aresta(u, w)
+        # Remove apenas as arestas que incidem no vértice
+        for e in list(self._saida[i].values()):
+            self._apagar_aresta(e)
+        for e in list(self._entrada[i].values()):
+            self._apagar_aresta(e)
         
-        if self.representacao == 'matriz':
-            self._matriz_atualizada = False
-        else:
-            del self.estrutura[v]
-            # Remove referências ao vértice em outras listas
-            for u in self.estrutura:
-                self.estrutura[u] = [(vertice, peso) for vertice, peso in self.estrutura[u] if vertice != v]
+        self._remover_id_vertice(i)
+        self._compactar_arestas()
     
     def definir_peso_vertice(self, v: str, peso: float):
         """
@@ -150,9 +429,10 @@ class Grafo:
             v: Vértice
             peso: Peso do vértice
         """
-        if v not in self.vertices:
+        if v not in self._ids:
             raise ValueError("Vértice inválido")
-        self.pesos_vertices[v] = peso
+        self._pesos_vertices[self._ids[v]] = peso
+        self._versao += 1
     
     def definir_rotulo_vertice(self, v: str, rotulo: str):
         """
@@ -162,9 +442,10 @@ class Grafo:
             v: Vértice
             rotulo: Rótulo do vértice
         """
-        if v not in self.vertices:
+        if v not in self._ids:
             raise ValueError("Vértice inválido")
-        self.rotulos_vertices[v] = rotulo
+        self._rotulos_vertices[self._ids[v]] = rotulo
+        self._versao += 1
     
     def sao_adjacentes_vertices(self, u: str, v: str) -> bool:
         """
@@ -177,16 +458,13 @@ class Grafo:
         Returns:
             True se são adjacentes, False caso contrário
         """
+        i, j = self._ids.get(u), self._ids.get(v)
+        if i is None or j is None:
+            return False
         if self.representacao == 'matriz':
-            if not self._matriz_atualizada:
-                self._atualizar_matriz()
-            if u not in self._vertex_index or v not in self._vertex_index:
-                return False
-            i = self._vertex_index[u]
-            j = self._vertex_index[v]
-            return self.estrutura[i][j] != 0
+            return bool(self._matriz[i, j] != 0)
         else:
-            return any(vertice == v for vertice, _ in self.estrutura.get(u, []))
+            return j in self._saida[i]
     
     def quantidade_vertices(self) -> int:
         """
@@ -195,7 +473,7 @@ class Grafo:
         Returns:
             Número de vértices
         """
-        return len(self.vertices)
+        return len(self._nomes)
     
     def quantidade_arestas(self) -> int:
         """
@@ -204,7 +482,7 @@ class Grafo:
         Returns:
             Número de arestas
         """
-        return len(self.arestas)
+        return len(self._origem) - self._arestas_removidas
     
     def e_vazio(self) -> bool:
         """
@@ -213,16 +491,50 @@ class Grafo:
         Returns:
             True se o grafo é vazio, False caso contrário
         """
-        return len(self.arestas) == 0
+        return self.quantidade_arestas() == 0
+    
+    @staticmethod
+    def _abrir_csv(nome_arquivo: str, modo: str):
+        """
+        Abre um arquivo CSV em modo texto com buffer grande
+        
+        Arquivos gzip são detectados pelo conteúdo na leitura e pela extensão '.gz' na escrita.
+        """
+        if modo == 'r':
+            with open(nome_arquivo, 'rb') as arquivo:
+                comprimido = arquivo.read(2) == b'\x1f\x8b'
+        else:
+            comprimido = str(nome_arquivo).endswith('.gz')
+        
+        if comprimido:
+            return gzip.open(nome_arquivo, modo + 't', newline='')
+        return open(nome_arquivo, modo, newline='', buffering=Grafo.TAMANHO_BUFFER_CSV)
+    
+    @staticmethod
+    def _escrever_em_lotes(writer, linhas: Iterable[list], tamanho_lote: int):
+        """Escreve as linhas no CSV em lotes de tamanho_lote"""
+        linhas = iter(linhas)
+        while True:
+            lote = list(islice(linhas, tamanho_lote))
+            if not lote:
+                break
+            writer.writerows(lote)
+    
+    @staticmethod
+    def _formatar_peso(peso):
+        """Escreve pesos inteiros sem a parte decimal (7 em vez de 7.0), como antes dos pesos em float"""
+        return int(peso) if isinstance(peso, float) and peso.is_integer() else peso
     
-    def exportar_csv(self, nome_arquivo: str):
+    def exportar_csv(self, nome_arquivo: str, ordenar: bool = True, tamanho_lote: int = 10000):
         """
         Exporta o grafo para um arquivo CSV
         
         Args:
-            nome_arquivo: Nome do arquivo CSV de saída
+            nome_arquivo: Nome do arquivo CSV de saída (terminado em '.gz' para gravar comprimido)
+            ordenar: Se False, grava vértices e arestas na ordem interna, sem ordenar (mais rápido)
+            tamanho_lote: Quantidade de linhas gravadas por vez
         """
-        with open(nome_arquivo, 'w', newline='') as csvfile:
+        with self._abrir_csv(nome_arquivo, 'w') as csvfile:
             writer = csv.writer(csvfile)
             
             # Escreve cabeçalho com informações básicas
@@ -233,31 +545,37 @@ class Grafo:
             # Escreve vértices
             writer.writerow([])
             writer.writerow(['Vertices'])
-            for v in sorted(self.vertices):
-                peso = self.pesos_vertices.get(v, '')
-                rotulo = self.rotulos_vertices.get(v, '')
-                writer.writerow([v, peso, rotulo])
+            vertices = sorted(self.vertices) if ordenar else self.vertices
+            pesos_vertices, rotulos_vertices = self.pesos_vertices, self.rotulos_vertices
+            formatar = self._formatar_peso
+            self._escrever_em_lotes(writer, (
+                [v, formatar(pesos_vertices.get(v, '')), rotulos_vertices.get(v, '')]
+                for v in vertices
+            ), tamanho_lote)
             
             # Escreve arestas
             writer.writerow([])
             writer.writerow(['Arestas', 'Origem', 'Destino', 'Peso', 'Rotulo'])
-            for u, v in sorted(self.arestas):
-                peso = self.pesos_arestas.get((u, v), '')
-                rotulo = self.rotulos_arestas.get((u, v), '')
-                writer.writerow(['', u, v, peso, rotulo])
+            arestas = sorted(self.arestas) if ordenar else self.arestas
+            pesos_arestas, rotulos_arestas = self.pesos_arestas, self.rotulos_arestas
+            self._escrever_em_lotes(writer, (
+                ['', u, v, formatar(pesos_arestas.get((u, v), '')), rotulos_arestas.get((u, v), '')]
+                for u, v in arestas
+            ), tamanho_lote)
     
     @classmethod
-    def importar_csv(cls, nome_arquivo: str) -> 'Grafo':
+    def importar_csv(cls, nome_arquivo: str, tamanho_lote: int = 100000) -> 'Grafo':
         """
-        Importa um grafo de um arquivo CSV
+        Importa um grafo de um arquivo CSV (comprimido com gzip ou não)
         
         Args:
             nome_arquivo: Nome do arquivo CSV de entrada
+            tamanho_lote: Quantidade de arestas lidas antes de cada inserção em lote
             
         Returns:
             Instância de Grafo reconstruída a partir do arquivo
         """
-        with open(nome_arquivo, 'r') as csvfile:
+        with cls._abrir_csv(nome_arquivo, 'r') as csvfile:
             reader = csv.reader(csvfile)
             
             # Lê informações básicas
@@ -281,14 +599,20 @@ class Grafo:
                 peso = float(peso) if peso else 1.0
                 grafo.adicionar_vertice(v, peso, rotulo)
             
-            # Lê arestas (pula cabeçalho)
+            # Lê arestas (pula cabeçalho) e insere em lotes
             next(reader)  # Pula linha do cabeçalho
+            arestas = []
             for linha in reader:
                 if not linha:  # Linha vazia indica fim do arquivo
                     break
                 _, u, v, peso, rotulo = linha
                 peso = float(peso) if peso else 1.0
-                grafo.adicionar_aresta(u, v, peso, rotulo)
+                arestas.append((u, v, peso, rotulo))
+                if len(arestas) >= tamanho_lote:
+                    grafo.adicionar_arestas(arestas)
+                    arestas = []
+            if arestas:
+                grafo.adicionar_arestas(arestas)
             
             return grafo
     
@@ -374,23 +698,30 @@ class Grafo:
         Returns:
             Lista de vértices vizinhos
         """
-        if v not in self.vertices:
+        i = self._ids.get(v)
+        if i is None:
             raise ValueError("Vértice não existe")
             
         if self.representacao == 'matriz':
-            if not self._matriz_atualizada:
-                self._atualizar_matriz()
-            if v not in self._vertex_index:
-                return []
-            
-            vizinhos = []
-            index = self._vertex_index[v]
-            for vertice, i in self._vertex_index.items():
-                if self.estrutura[index][i] != 0:
-                    vizinhos.append(vertice)
-            return vizinhos
+            linha = self._matriz[i, :len(self._nomes)]
+            return [self._nomes[j] for j in np.flatnonzero(linha)]
         else:
-            return [vizinho for vizinho, _ in self.estrutura.get(v, [])]
+            return [self._nomes[j] for j in self._saida[i]]
+
+    def obter_vizinhos_pesos(self, v: str) -> List[Tuple[str, float]]:
+        """
+        Retorna os vizinhos de saída de um vértice com os pesos das arestas, em O(grau)
+        
+        Args:
+            v: Vértice para obter vizinhos
+            
+        Returns:
+            Lista de tuplas (vizinho, peso)
+        """
+        i = self._ids.get(v)
+        if i is None:
+            raise ValueError("Vértice não existe")
+        return [(self._nomes[j], self._peso[e]) for j, e in self._saida[i].items()]
 
     def grau_vertice(self, v: str) -> int:
         """
@@ -402,12 +733,70 @@ class Grafo:
         Returns:
             Número de arestas conectadas ao vértice
         """
+        i = self._ids.get(v)
+        if i is None:
+            return 0
         if self.representacao == 'matriz':
-            return len(self.obter_vizinhos(v))
+            return int(np.count_nonzero(self._matriz[i, :len(self._nomes)]))
         else:
-            return len(self.estrutura.get(v, []))
+            return len(self._saida[i])
+        
         
+    def _id_existente(self, v: str) -> int:
+        """Retorna o id de um vértice existente"""
+        i = self._ids.get(v)
+        if i is None:
+            raise ValueError("Vértice não existe")
+        return i
+
+    def obter_predecessores(self, v: str) -> List[str]:
+        """
+        Retorna a lista de vértices com arestas chegando em um vértice
+        
+        Args:
+            v: Vértice para obter os predecessores
+            
+        Returns:
+            Lista de vértices predecessores
+        """
+        return [self._nomes[k] for k in self._entrada[self._id_existente(v)]]
+
+    def obter_predecessores_pesos(self, v: str) -> List[Tuple[str, float]]:
+        """
+        Retorna os vértices com arestas chegando em um vértice, com os pesos das arestas, em O(grau)
         
+        Args:
+            v: Vértice para obter os predecessores
+            
+        Returns:
+            Lista de tuplas (predecessor, peso)
+        """
+        return [(self._nomes[k], self._peso[e]) for k, e in self._entrada[self._id_existente(v)].items()]
+
+    def grau_entrada(self, v: str) -> int:
+        """
+        Retorna o grau de entrada de um vértice (número de arestas chegando nele)
+        """
+        return len(self._entrada[self._id_existente(v)])
+
+    def grau_saida(self, v: str) -> int:
+        """
+        Retorna o grau de saída de um vértice (número de arestas partindo dele)
+        """
+        return len(self._saida[self._id_existente(v)])
+
+    def forca_entrada(self, v: str) -> float:
+        """
+        Retorna a força de entrada de um vértice (soma dos pesos das arestas de entrada)
+        """
+        return self._forca_entrada[self._id_existente(v)]
+
+    def forca_saida(self, v: str) -> float:
+        """
+        Retorna a força de saída de um vértice (soma dos pesos das arestas de saída)
+        """
+        return self._forca_saida[self._id_existente(v)]
+
     def sao_adjacentes_arestas(self, u1: str, v1: str, u2: str, v2: str) -> bool:
         """
         Verifica se duas arestas são adjacentes (compartilham um vértice)
@@ -424,16 +813,250 @@ class Grafo:
         """
         Verifica se o grafo é completo (todos os vértices estão conectados entre si)
         """
-        n = len(self.vertices)
-        if self.representacao == 'matriz':
-            if not self._matriz_atualizada:
-                self._atualizar_matriz()
-            expected_edges = n * (n - 1)  # para grafo direcionado
-            return len(self.arestas) == expected_edges
-        else:
-            expected_edges = n * (n - 1)  # para grafo direcionado
-            actual_edges = sum(len(vizinhos) for vizinhos in self.estrutura.values())
-            return actual_edges == expected_edges
+        n = self.quantidade_vertices()
+        expected_edges = n * (n - 1)  # para grafo direcionado
+        return self.quantidade_arestas() == expected_edges
+
+    def _vizinhanca_nao_direcionada(self) -> List[List[int]]:
+        """Vizinhos de cada id ignorando a direção das arestas (sem laços nem repetições)"""
+        vizinhanca = []
+        for i, (saida, entrada) in enumerate(zip(self._saida, self._entrada)):
+            vizinhos = set(saida)
+            vizinhos.update(entrada)
+            vizinhos.discard(i)
+            vizinhanca.append(list(vizinhos))
+        return vizinhanca
+
+    def componentes_fortemente_conexas(self) -> List[List[str]]:
+        """
+        Encontra as componentes fortemente conexas (Tarjan iterativo, O(V+E))
+        
+        Returns:
+            Lista de componentes, cada uma com os nomes dos seus vértices
+        """
+        n = len(self._nomes)
+        indice = [-1] * n
+        menor = [0] * n
+        na_pilha = [False] * n
+        pilha = []
+        componentes = []
+        tempo = 0
+        
+        for raiz in range(n):
+            if indice[raiz] >= 0:
+                continue
+            indice[raiz] = menor[raiz] = tempo
+            tempo += 1
+            pilha.append(raiz)
+            na_pilha[raiz] = True
+            busca = [(raiz, iter(self._saida[raiz]))]
+            
+            while busca:
+                v, vizinhos = busca[-1]
+                for w in vizinhos:
+                    if indice[w] < 0:
+                        indice[w] = menor[w] = tempo
+                        tempo += 1
+                        pilha.append(w)
+                        na_pilha[w] = True
+                        busca.append((w, iter(self._saida[w])))
+                        break
+                    elif na_pilha[w]:
+                        menor[v] = min(menor[v], indice[w])
+                else:
+                    busca.pop()
+                    if busca:
+                        pai = busca[-1][0]
+                        menor[pai] = min(menor[pai], menor[v])
+                    if menor[v] == indice[v]:
+                        componente = []
+                        while True:
+                            w = pilha.pop()
+                            na_pilha[w] = False
+                            componente.append(self._nomes[w])
+                            if w == v:
+                                break
+                        componentes.append(componente)
+        
+        return componentes
+
+    def componentes_fracamente_conexas(self) -> List[List[str]]:
+        """
+        Encontra as componentes fracamente conexas (ignorando a direção das arestas), em O(V+E)
+        
+        Returns:
+            Lista de componentes, cada uma com os nomes dos seus vértices
+        """
+        vizinhanca = self._vizinhanca_nao_direcionada()
+        visitado = [False] * len(self._nomes)
+        componentes = []
+        for raiz in range(len(self._nomes)):
+            if visitado[raiz]:
+                continue
+            visitado[raiz] = True
+            pilha = [raiz]
+            componente = []
+            while pilha:
+                v = pilha.pop()
+                componente.append(self._nomes[v])
+                for w in vizinhanca[v]:
+                    if not visitado[w]:
+                        visitado[w] = True
+                        pilha.append(w)
+            componentes.append(componente)
+        return componentes
+
+    def _busca_cortes(self) -> Tuple[Dict[int, List[int]], List[Tuple[int, int]]]:
+        """
+        Busca em profundidade iterativa (Hopcroft-Tarjan) sobre o grafo não direcionado
+        
+        Returns:
+            Tupla (pedaços deixados pela remoção de cada ponto de articulação, pontes),
+            com os tamanhos das componentes resultantes dentro da componente do vértice
+        """
+        vizinhanca = self._vizinhanca_nao_direcionada()
+        n = len(self._nomes)
+        descoberta = [-1] * n
+        menor = [0] * n
+        tamanho = [1] * n
+        pai = [-1] * n
+        separados = [[] for _ in range(n)]  # Subárvores que se separam ao remover o vértice
+        pontes = []
+        cortes = {}
+        tempo = 0
+        
+        for raiz in range(n):
+            if descoberta[raiz] >= 0:
+                continue
+            descoberta[raiz] = menor[raiz] = tempo
+            tempo += 1
+            busca = [(raiz, iter(vizinhanca[raiz]))]
+            visitados = [raiz]
+            
+            while busca:
+                v, vizinhos = busca[-1]
+                for w in vizinhos:
+                    if descoberta[w] < 0:
+                        pai[w] = v
+                        descoberta[w] = menor[w] = tempo
+                        tempo += 1
+                        busca.append((w, iter(vizinhanca[w])))
+                        visitados.append(w)
+                        break
+                    elif w != pai[v]:
+                        menor[v] = min(menor[v], descoberta[w])
+                else:
+                    busca.pop()
+                    if busca:
+                        p = busca[-1][0]
+                        menor[p] = min(menor[p], menor[v])
+                        tamanho[p] += tamanho[v]
+                        if menor[v] >= descoberta[p]:
+                            separados[p].append(tamanho[v])
+                        if menor[v] > descoberta[p]:
+                            pontes.append((p, v))
+            
+            # Pedaços resultantes da remoção de cada ponto de articulação desta componente
+            total = tamanho[raiz]
+            for v in visitados:
+                if v == raiz:
+                    if len(separados[v]) >= 2:
+                        cortes[v] = separados[v]
+                elif separados[v]:
+                    cortes[v] = separados[v] + [total - 1 - sum(separados[v])]
+        
+        return cortes, pontes
+
+    def pontos_articulacao(self) -> List[str]:
+        """
+        Retorna os pontos de articulação do grafo não direcionado subjacente, em O(V+E)
+        """
+        cortes, _ = self._busca_cortes()
+        return [self._nomes[v] for v in cortes]
+
+    def pontes(self) -> List[Tuple[str, str]]:
+        """
+        Retorna as pontes do grafo não direcionado subjacente, em O(V+E)
+        
+        Returns:
+            Lista de pares (u, v) cuja ligação, se removida, desconecta o grafo
+        """
+        _, pontes = self._busca_cortes()
+        return [(self._nomes[u], self._nomes[v]) for u, v in pontes]
+
+    def pontuar_pontos_articulacao(self) -> Dict[str, Dict]:
+        """
+        Pontua cada ponto de articulação pelas componentes deixadas ao removê-lo, em O(V+E)
+        
+        Returns:
+            Dicionário vértice -> {'componentes': quantidade de componentes em que a sua
+            componente se divide, 'tamanhos': tamanhos delas (decrescente),
+            'pares_desconectados': pares de vértices que deixam de estar conectados}
+        """
+        cortes, _ = self._busca_cortes()
+        pontuacao = {}
+        for v, tamanhos in cortes.items():
+            total = sum(tamanhos)
+            pontuacao[self._nomes[v]] = {
+                'componentes': len(tamanhos),
+                'tamanhos': sorted(tamanhos, reverse=True),
+                'pares_desconectados': (total * total - sum(t * t for t in tamanhos)) // 2,
+            }
+        return pontuacao
+
+    def snapshot_csr(self) -> 'GrafoCSR':
+        """
+        Gera um snapshot imutável do grafo em formato CSR (compressed sparse row)
+        
+        O snapshot é construído em O(V+E) a partir do índice de sucessores,
+        independentemente da representação, e não acompanha alterações posteriores.
+        Os ids do snapshot coincidem com os ids internos atuais dos vértices.
+        
+        Returns:
+            Instância de GrafoCSR com ids inteiros para os vértices
+        """
+        offsets = [0]
+        destinos = []
+        ids_arestas = []
+        for saida in self._saida:
+            destinos.extend(saida.keys())
+            ids_arestas.extend(saida.values())
+            offsets.append(len(destinos))
+        
+        pesos_vertices = np.frombuffer(self._pesos_vertices, dtype=np.float64)
+        return GrafoCSR(
+            self._nomes, offsets, destinos,
+            np.frombuffer(self._peso, dtype=np.float64)[ids_arestas] if ids_arestas else [],
+            pesos_vertices=np.where(np.isnan(pesos_vertices), 1.0, pesos_vertices),
+            rotulos_vertices=self._rotulos_vertices,
+            rotulos_arestas=[self._rotulo[e] for e in ids_arestas],
+            representacao=self.representacao,
+        )
+
+    def salvar_binario(self, caminho: str):
+        """
+        Salva o grafo no formato binário de snapshot (ver GrafoCSR.salvar_binario)
+        
+        Args:
+            caminho: Caminho do arquivo de saída
+        """
+        self.snapshot_csr().salvar_binario(caminho)
+
+    @classmethod
+    def carregar_binario(cls, caminho: str) -> 'Grafo':
+        """
+        Reconstrói um grafo editável a partir de um snapshot binário
+        
+        Para apenas consultar o grafo sem copiá-lo para a memória, use
+        GrafoCSR.carregar_binario, que mapeia o arquivo diretamente.
+        
+        Args:
+            caminho: Caminho do arquivo de snapshot
+            
+        Returns:
+            Instância de Grafo reconstruída a partir do arquivo
+        """
+        return GrafoCSR.carregar_binario(caminho).para_grafo()
 
     @classmethod
     def criar_grafo_com_vertices(cls, num_vertices: int, representacao: str = 'lista') -> 'Grafo':
@@ -443,4 +1066,538 @@ class Grafo:
         grafo = cls(representacao)
         for i in range(num_vertices):
             grafo.adicionar_vertice(f"v{i}")
-        return grafo
\ No newline at end of file
+        return grafo
+
+
+NAO_DEFINIDO = float('nan')  # Marca atributos de vértice não definidos nos arrays tipados
+
+
+class _VisaoArestas(Set):
+    """Visão das arestas (u, v) de um Grafo como conjunto somente leitura"""
+    __slots__ = ('_grafo',)
+
+    def __init__(self, grafo: Grafo):
+        self._grafo = grafo
+
+    @classmethod
+    def _from_iterable(cls, it):
+        return set(it)
+
+    def _id(self, aresta) -> Optional[int]:
+        """Id da aresta (u, v), ou None se ela não existe"""
+        g = self._grafo
+        try:
+            u, v = aresta
+        except (TypeError, ValueError):
+            return None
+        i, j = g._ids.get(u), g._ids.get(v)
+        if i is None or j is None:
+            return None
+        return g._saida[i].get(j)
+
+    def __contains__(self, aresta) -> bool:
+        return self._id(aresta) is not None
+
+    def __iter__(self):
+        g = self._grafo
+        nomes = g._nomes
+        for i, j in zip(g._origem, g._destino):
+            if i >= 0:
+                yield (nomes[i], nomes[j])
+
+    def __len__(self) -> int:
+        return self._grafo.quantidade_arestas()
+
+
+class _VisaoPesosArestas(Mapping):
+    """Visão somente leitura de (u, v) -> peso da aresta"""
+    __slots__ = ('_arestas',)
+
+    def __init__(self, grafo: Grafo):
+        self._arestas = _VisaoArestas(grafo)
+
+    def __getitem__(self, aresta) -> float:
+        e = self._arestas._id(aresta)
+        if e is None:
+            raise KeyError(aresta)
+        return self._arestas._grafo._peso[e]
+
+    def __iter__(self):
+        return iter(self._arestas)
+
+    def __len__(self) -> int:
+        return len(self._arestas)
+
+
+class _VisaoRotulosArestas(Mapping):
+    """Visão somente leitura de (u, v) -> rótulo, apenas para arestas rotuladas"""
+    __slots__ = ('_arestas',)
+
+    def __init__(self, grafo: Grafo):
+        self._arestas = _VisaoArestas(grafo)
+
+    def __getitem__(self, aresta) -> str:
+        e = self._arestas._id(aresta)
+        if e is None or not self._arestas._grafo._rotulo[e]:
+            raise KeyError(aresta)
+        return self._arestas._grafo._rotulo[e]
+
+    def __iter__(self):
+        g = self._arestas._grafo
+        nomes = g._nomes
+        for i, j, rotulo in zip(g._origem, g._destino, g._rotulo):
+            if i >= 0 and rotulo:
+                yield (nomes[i], nomes[j])
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+
+class _VisaoAtributoVertices(Mapping):
+    """Visão somente leitura de vértice -> atributo, apenas onde o atributo foi definido"""
+    __slots__ = ('_grafo', '_coluna', '_definido')
+
+    def __init__(self, grafo: Grafo, coluna: str, definido):
+        self._grafo = grafo
+        self._coluna = coluna
+        self._definido = definido
+
+    def __getitem__(self, v: str):
+        i = self._grafo._ids.get(v)
+        if i is not None:
+            valor = getattr(self._grafo, self._coluna)[i]
+            if self._definido(valor):
+                return valor
+        raise KeyError(v)
+
+    def __iter__(self):
+        coluna = getattr(self._grafo, self._coluna)
+        for v, valor in zip(self._grafo._nomes, coluna):
+            if self._definido(valor):
+                yield v
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+
+class _VisaoAdjacencia(Mapping):
+    """Visão somente leitura da lista de adjacência: vértice -> [(vizinho, peso)]"""
+    __slots__ = ('_grafo',)
+
+    def __init__(self, grafo: Grafo):
+        self._grafo = grafo
+
+    def __getitem__(self, v: str) -> List[Tuple[str, float]]:
+        g = self._grafo
+        i = g._ids[v]
+        return [(g._nomes[j], g._peso[e]) for j, e in g._saida[i].items()]
+
+    def __iter__(self):
+        return iter(self._grafo._nomes)
+
+    def __len__(self) -> int:
+        return len(self._grafo._nomes)
+
+
+class _TabelaTextos:
+    """
+    Sequência imutável de textos armazenada como bytes UTF-8 contíguos e offsets
+    
+    O texto i ocupa dados[offsets[i]:offsets[i + 1]] e só é decodificado quando acessado.
+    """
+    __slots__ = ('dados', 'offsets')
+
+    def __init__(self, dados: np.ndarray, offsets: np.ndarray):
+        self.dados = dados
+        self.offsets = offsets
+
+    @classmethod
+    def de_textos(cls, textos: Iterable[str]) -> '_TabelaTextos':
+        """Codifica uma sequência de textos em uma tabela contígua"""
+        codificados = [t.encode('utf-8') for t in textos]
+        offsets = np.zeros(len(codificados) + 1, dtype=np.int64)
+        np.cumsum([len(c) for c in codificados], out=offsets[1:])
+        dados = np.frombuffer(b''.join(codificados), dtype=np.uint8)
+        return cls(dados, offsets)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> str:
+        return self.dados[self.offsets[i]:self.offsets[i + 1]].tobytes().decode('utf-8')
+
+    def __iter__(self):
+        dados = self.dados.tobytes()
+        offsets = self.offsets.tolist()
+        for i in range(len(offsets) - 1):
+            yield dados[offsets[i]:offsets[i + 1]].decode('utf-8')
+
+    def __reduce__(self):
+        return (_TabelaTextos, (np.asarray(self.dados), np.asarray(self.offsets)))
+
+
+class GrafoCSR:
+    """
+    Snapshot imutável de um grafo direcionado em formato CSR (compressed sparse row)
+    
+    Os vizinhos de saída do vértice i são destinos[offsets[i]:offsets[i + 1]], com os
+    pesos e rótulos correspondentes nas mesmas posições de pesos e rotulos_arestas.
+    """
+    __slots__ = ('nomes', 'offsets', 'destinos', 'pesos', 'pesos_vertices',
+                 'rotulos_vertices', 'rotulos_arestas', 'representacao', 'caminho', '_indice')
+    
+    MAGICO = b'GRAFOCSR'  # Assinatura do formato binário
+    VERSAO = 1  # Versão atual do formato binário
+    ALINHAMENTO = 64  # Alinhamento (em bytes) de cada seção do arquivo binário
+
+    def __init__(self, nomes: Sequence[str], offsets: Sequence[int],
+                 destinos: Sequence[int], pesos: Sequence[float],
+                 pesos_vertices: Optional[Sequence[float]] = None,
+                 rotulos_vertices: Optional[Sequence[str]] = None,
+                 rotulos_arestas: Optional[Sequence[str]] = None,
+                 representacao: str = 'lista', caminho: Optional[str] = None):
+        """
+        Args:
+            nomes: Tabela de nomes dos vértices (posição = id inteiro)
+            offsets: Início da faixa de arestas de cada vértice (tamanho V+1)
+            destinos: Id do vértice de destino de cada aresta (tamanho E)
+            pesos: Peso de cada aresta (tamanho E)
+            pesos_vertices: Peso de cada vértice (opcional, padrão=1)
+            rotulos_vertices: Rótulo de cada vértice (opcional, padrão='')
+            rotulos_arestas: Rótulo de cada aresta (opcional, padrão='')
+            representacao: Representação do grafo de origem
+            caminho: Arquivo binário que contém os dados, quando mapeado da memória
+        """
+        self.nomes = nomes if isinstance(nomes, _TabelaTextos) else tuple(nomes)
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.destinos = np.asarray(destinos, dtype=np.int64)
+        self.pesos = np.asarray(pesos, dtype=np.float64)
+        n = len(self.nomes)
+        m = len(self.destinos)
+        self.pesos_vertices = np.asarray(
+            pesos_vertices if pesos_vertices is not None else np.ones(n), dtype=np.float64)
+        self.rotulos_vertices = self._textos(rotulos_vertices, n)
+        self.rotulos_arestas = self._textos(rotulos_arestas, m)
+        self.representacao = representacao
+        self.caminho = caminho
+        self._indice = None
+        
+        for coluna in (self.offsets, self.destinos, self.pesos, self.pesos_vertices):
+            coluna.setflags(write=False)
+
+    @staticmethod
+    def _textos(textos: Optional[Sequence[str]], n: int) -> Sequence[str]:
+        """Normaliza uma coluna de textos opcional para uma sequência imutável"""
+        if textos is None:
+            return ('',) * n
+        if isinstance(textos, _TabelaTextos):
+            return textos
+        return tuple(textos)
+
+    def __reduce__(self):
+        # Snapshots mapeados de arquivo são reabertos pelo caminho em vez de copiados
+        if self.caminho is not None:
+            return (GrafoCSR.carregar_binario, (self.caminho,))
+        return (GrafoCSR, (self.nomes, self.offsets, self.destinos, self.pesos,
+                           self.pesos_vertices, self.rotulos_vertices, self.rotulos_arestas,
+                           self.representacao))
+
+    @property
+    def indice(self) -> Dict[str, int]:
+        """Mapeamento somente leitura de nome do vértice para id (construído sob demanda)"""
+        if self._indice is None:
+            self._indice = MappingProxyType({v: i for i, v in enumerate(self.nomes)})
+        return self._indice
+
+    def quantidade_vertices(self) -> int:
+        """Retorna a quantidade de vértices do snapshot"""
+        return len(self.nomes)
+
+    def quantidade_arestas(self) -> int:
+        """Retorna a quantidade de arestas do snapshot"""
+        return len(self.destinos)
+
+    def vizinhos(self, i: int) -> np.ndarray:
+        """Retorna os ids dos vizinhos de saída do vértice i (visão, sem cópia)"""
+        return self.destinos[self.offsets[i]:self.offsets[i + 1]]
+
+    def pesos_vizinhos(self, i: int) -> np.ndarray:
+        """Retorna os pesos das arestas de saída do vértice i (visão, sem cópia)"""
+        return self.pesos[self.offsets[i]:self.offsets[i + 1]]
+
+    def origens(self) -> np.ndarray:
+        """Retorna o id do vértice de origem de cada aresta (tamanho E)"""
+        return np.repeat(np.arange(len(self.nomes), dtype=np.int64), np.diff(self.offsets))
+
+    def forca_saida(self) -> np.ndarray:
+        """Retorna a soma dos pesos das arestas de saída de cada vértice (tamanho V)"""
+        return np.bincount(self.origens(), weights=self.pesos, minlength=len(self.nomes))
+
+    def forca_entrada(self) -> np.ndarray:
+        """Retorna a soma dos pesos das arestas de entrada de cada vértice (tamanho V)"""
+        return np.bincount(self.destinos, weights=self.pesos, minlength=len(self.nomes))
+
+    def filtrar(self, vertices: Optional[Iterable[str]] = None, forca_minima: Optional[float] = None,
+                peso_minimo: Optional[float] = None) -> 'SubgrafoCSR':
+        """
+        Cria uma visão filtrada do snapshot, sem copiar os arrays
+        
+        Args:
+            vertices: Mantém apenas estes vértices
+            forca_minima: Mantém apenas vértices com força de saída (no snapshot completo)
+                maior ou igual a este valor
+            peso_minimo: Mantém apenas arestas com peso maior ou igual a este valor
+            
+        Returns:
+            Visão com as arestas cujas duas pontas passaram pelos filtros
+        """
+        return SubgrafoCSR(self).filtrar(vertices, forca_minima, peso_minimo)
+
+    def para_grafo(self, representacao: Optional[str] = None) -> Grafo:
+        """
+        Reconstrói um Grafo editável a partir do snapshot
+        
+        Args:
+            representacao: 'lista' ou 'matriz' (padrão: a do grafo de origem)
+            
+        Returns:
+            Nova instância de Grafo
+        """
+        grafo = Grafo(representacao or self.representacao)
+        nomes = list(self.nomes)
+        for v, peso, rotulo in zip(nomes, self.pesos_vertices.tolist(), self.rotulos_vertices):
+            grafo.adicionar_vertice(v, peso, rotulo)
+        
+        grafo.adicionar_arestas(
+            origens=[nomes[i] for i in self.origens().tolist()],
+            destinos=[nomes[i] for i in self.destinos.tolist()],
+            pesos=self.pesos.tolist(),
+            rotulos=list(self.rotulos_arestas),
+        )
+        return grafo
+
+    def _secoes(self) -> Dict[str, np.ndarray]:
+        """Arrays que compõem o formato binário, na ordem em que são gravados"""
+        secoes = {
+            'offsets': self.offsets,
+            'destinos': self.destinos,
+            'pesos': self.pesos,
+            'pesos_vertices': self.pesos_vertices,
+        }
+        for nome in ('nomes', 'rotulos_vertices', 'rotulos_arestas'):
+            textos = getattr(self, nome)
+            tabela = textos if isinstance(textos, _TabelaTextos) else _TabelaTextos.de_textos(textos)
+            secoes[nome + '_dados'] = tabela.dados
+            secoes[nome + '_offsets'] = tabela.offsets
+        return secoes
+
+    @classmethod
+    def _alinhar(cls, posicao: int) -> int:
+        """Arredonda a posição para o próximo múltiplo do alinhamento"""
+        return -(-posicao // cls.ALINHAMENTO) * cls.ALINHAMENTO
+
+    def salvar_binario(self, caminho: str):
+        """
+        Salva o snapshot em um arquivo binário versionado e mapeável em memória
+        
+        O arquivo contém a assinatura, a versão, um cabeçalho JSON descrevendo as seções
+        e, em seguida, cada array (little-endian) alinhado a ALINHAMENTO bytes.
+        
+        Args:
+            caminho: Caminho do arquivo de saída
+        """
+        secoes = {}
+        descricao = {}
+        posicao = 0
+        for nome, array in self._secoes().items():
+            array = np.ascontiguousarray(array, dtype=np.asarray(array).dtype.newbyteorder('<'))
+            secoes[nome] = array
+            descricao[nome] = {'dtype': array.dtype.str, 'tamanho': len(array), 'posicao': posicao}
+            posicao = self._alinhar(posicao + array.nbytes)
+        
+        cabecalho = json.dumps({
+            'representacao': self.representacao,
+            'secoes': descricao,
+        }).encode('utf-8')
+        inicio = self._alinhar(len(self.MAGICO) + 8 + len(cabecalho))
+        
+        with open(caminho, 'wb') as arquivo:
+            arquivo.write(self.MAGICO)
+            arquivo.write(struct.pack('<II', self.VERSAO, len(cabecalho)))
+            arquivo.write(cabecalho)
+            for nome, array in secoes.items():
+                arquivo.write(b'\0' * (inicio + descricao[nome]['posicao'] - arquivo.tell()))
+                arquivo.write(array.tobytes())
+
+    @classmethod
+    def carregar_binario(cls, caminho: str) -> 'GrafoCSR':
+        """
+        Abre um snapshot binário mapeando o arquivo em memória (somente leitura)
+        
+        Nenhum array é copiado: as páginas são lidas sob demanda pelo sistema operacional
+        e compartilhadas entre processos que abrirem o mesmo arquivo.
+        
+        Args:
+            caminho: Caminho do arquivo de snapshot
+            
+        Returns:
+            Instância de GrafoCSR apoiada no arquivo
+        """
+        with open(caminho, 'rb') as arquivo:
+            if arquivo.read(len(cls.MAGICO)) != cls.MAGICO:
+                raise ValueError("Arquivo não é um snapshot binário de grafo")
+            versao, tamanho_cabecalho = struct.unpack('<II', arquivo.read(8))
+            if versao != cls.VERSAO:
+                raise ValueError(f"Versão de snapshot não suportada: {versao}")
+            cabecalho = json.loads(arquivo.read(tamanho_cabecalho).decode('utf-8'))
+        
+        inicio = cls._alinhar(len(cls.MAGICO) + 8 + tamanho_cabecalho)
+        mapa = np.memmap(caminho, dtype=np.uint8, mode='r')
+        
+        secoes = {}
+        for nome, info in cabecalho['secoes'].items():
+            dtype = np.dtype(info['dtype'])
+            posicao = inicio + info['posicao']
+            secoes[nome] = mapa[posicao:posicao + info['tamanho'] * dtype.itemsize].view(dtype)
+        
+        def tabela(nome):
+            return _TabelaTextos(secoes[nome + '_dados'], secoes[nome + '_offsets'])
+        
+        return cls(
+            tabela('nomes'), secoes['offsets'], secoes['destinos'], secoes['pesos'],
+            pesos_vertices=secoes['pesos_vertices'],
+            rotulos_vertices=tabela('rotulos_vertices'),
+            rotulos_arestas=tabela('rotulos_arestas'),
+            representacao=cabecalho['representacao'],
+            caminho=caminho,
+        )
+
+
+class SubgrafoCSR:
+    """
+    Visão filtrada de um GrafoCSR: máscaras de vértices e arestas sobre os arrays
+    do snapshot, que não são copiados
+    
+    Os ids dos vértices são os do snapshot de origem.
+    """
+    __slots__ = ('csr', 'mascara_vertices', 'mascara_arestas', '_forca_saida')
+
+    def __init__(self, csr: GrafoCSR, mascara_vertices: Optional[np.ndarray] = None,
+                 mascara_arestas: Optional[np.ndarray] = None, forca_saida: Optional[np.ndarray] = None):
+        """
+        Args:
+            csr: Snapshot de origem
+            mascara_vertices: Vértices mantidos (padrão: todos)
+            mascara_arestas: Arestas mantidas (padrão: todas)
+            forca_saida: Força de saída de cada vértice no snapshot (calculada se omitida)
+        """
+        self.csr = csr
+        self.mascara_vertices = (mascara_vertices if mascara_vertices is not None
+                                 else np.ones(csr.quantidade_vertices(), dtype=bool))
+        self.mascara_arestas = (mascara_arestas if mascara_arestas is not None
+                                else np.ones(csr.quantidade_arestas(), dtype=bool))
+        self._forca_saida = forca_saida
+
+    def filtrar(self, vertices: Optional[Iterable[str]] = None, forca_minima: Optional[float] = None,
+                peso_minimo: Optional[float] = None) -> 'SubgrafoCSR':
+        """
+        Aplica novos filtros sobre esta visão (os filtros anteriores continuam valendo)
+        
+        Args:
+            vertices: Mantém apenas estes vértices
+            forca_minima: Mantém apenas vértices com força de saída (no snapshot completo)
+                maior ou igual a este valor
+            peso_minimo: Mantém apenas arestas com peso maior ou igual a este valor
+            
+        Returns:
+            Nova visão sobre o mesmo snapshot
+        """
+        mascara_vertices = self.mascara_vertices.copy()
+        if vertices is not None:
+            selecionados = np.zeros(len(mascara_vertices), dtype=bool)
+            indice = self.csr.indice
+            selecionados[[indice[v] for v in vertices if v in indice]] = True
+            mascara_vertices &= selecionados
+        if forca_minima is not None:
+            if self._forca_saida is None:
+                self._forca_saida = self.csr.forca_saida()
+            mascara_vertices &= self._forca_saida >= forca_minima
+        
+        mascara_arestas = self.mascara_arestas.copy()
+        if peso_minimo is not None:
+            mascara_arestas &= self.csr.pesos >= peso_minimo
+        if vertices is not None or forca_minima is not None:
+            mascara_arestas &= mascara_vertices[self.csr.origens()] & mascara_vertices[self.csr.destinos]
+        
+        return SubgrafoCSR(self.csr, mascara_vertices, mascara_arestas, self._forca_saida)
+
+    def __contains__(self, v: str) -> bool:
+        i = self.csr.indice.get(v)
+        return i is not None and bool(self.mascara_vertices[i])
+
+    def vertices(self) -> List[str]:
+        """Retorna os nomes dos vértices mantidos"""
+        return [self.csr.nomes[i] for i in np.flatnonzero(self.mascara_vertices).tolist()]
+
+    def quantidade_vertices(self) -> int:
+        """Retorna a quantidade de vértices mantidos"""
+        return int(np.count_nonzero(self.mascara_vertices))
+
+    def quantidade_arestas(self) -> int:
+        """Retorna a quantidade de arestas mantidas"""
+        return int(np.count_nonzero(self.mascara_arestas))
+
+    def vizinhos(self, i: int) -> np.ndarray:
+        """Retorna os ids dos vizinhos de saída do vértice i que permanecem na visão"""
+        inicio, fim = self.csr.offsets[i], self.csr.offsets[i + 1]
+        return self.csr.destinos[inicio:fim][self.mascara_arestas[inicio:fim]]
+
+    def pesos_vizinhos(self, i: int) -> np.ndarray:
+        """Retorna os pesos das arestas de saída do vértice i que permanecem na visão"""
+        inicio, fim = self.csr.offsets[i], self.csr.offsets[i + 1]
+        return self.csr.pesos[inicio:fim][self.mascara_arestas[inicio:fim]]
+
+    def arestas(self) -> Iterator[Tuple[str, str, float]]:
+        """Percorre as arestas mantidas como tuplas (origem, destino, peso)"""
+        nomes = self.csr.nomes
+        posicoes = np.flatnonzero(self.mascara_arestas)
+        origens = self.csr.origens()[posicoes].tolist()
+        destinos = self.csr.destinos[posicoes].tolist()
+        for u, v, peso in zip(origens, destinos, self.csr.pesos[posicoes].tolist()):
+            yield nomes[u], nomes[v], peso
+
+    def para_csr(self) -> GrafoCSR:
+        """
+        Materializa a visão como um novo snapshot compacto (com ids renumerados)
+        
+        Returns:
+            Nova instância de GrafoCSR
+        """
+        csr = self.csr
+        mantidos = np.flatnonzero(self.mascara_vertices)
+        novo_id = np.full(csr.quantidade_vertices(), -1, dtype=np.int64)
+        novo_id[mantidos] = np.arange(len(mantidos))
+        
+        posicoes = np.flatnonzero(self.mascara_arestas)
+        graus = np.bincount(novo_id[csr.origens()[posicoes]], minlength=len(mantidos))
+        offsets = np.zeros(len(mantidos) + 1, dtype=np.int64)
+        np.cumsum(graus, out=offsets[1:])
+        
+        return GrafoCSR([csr.nomes[i] for i in mantidos.tolist()], offsets,
+                        novo_id[csr.destinos[posicoes]], csr.pesos[posicoes],
+                        csr.pesos_vertices[mantidos],
+                        [csr.rotulos_vertices[i] for i in mantidos.tolist()],
+                        [csr.rotulos_arestas[p] for p in posicoes.tolist()],
+                        csr.representacao)
+
+    def para_grafo(self, representacao: Optional[str] = None) -> Grafo:
+        """
+        Materializa a visão como um Grafo editável
+        
+        Args:
+            representacao: 'lista' ou 'matriz' (padrão: a do snapshot de origem)
+            
+        Returns:
+            Nova instância de Grafo
+        """
+        return self.para_csr().para_grafo(representacao)